@@ -1,14 +1,26 @@
 # -*- coding: utf-8 -*-
 """ AWS pulic EO data bucket management module
 """
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
 from pathlib import Path
 import shutil
 from tempfile import gettempdir
-from typing import Optional, List
-
-from ewoc_dag.bucket.eobucket import EOBucket, EOBucketException
+from typing import Optional, List, Tuple
+
+try:
+    import awscrt  # pylint: disable=unused-import
+except ImportError:
+    _HAS_CRT = False
+else:
+    _HAS_CRT = True
+
+from ewoc_dag.bucket.eobucket import (
+    EOBucket,
+    EOBucketException,
+    make_download_transfer_config,
+)
 from ewoc_dag.eo_prd_id.l8_prd_id import L8C2PrdIdInfo
 from ewoc_dag.eo_prd_id.s1_prd_id import S1PrdIdInfo
 from ewoc_dag.eo_prd_id.s2_prd_id import S2PrdIdInfo
@@ -16,6 +28,11 @@ from ewoc_dag.safe_format import S1SafeConversionError, aws_to_safe
 
 logger = logging.getLogger(__name__)
 
+# The CRT transfer client (pip install ewoc_dag[crt]) drives many ranged GETs from
+# native code, it is only used with the AWS endpoint
+_AWS_TRANSFER_CLIENT = "crt" if _HAS_CRT else "classic"
+_AWS_DOWNLOAD_TRANSFER_CONFIG = make_download_transfer_config(crt=_HAS_CRT)
+
 
 class AWSDownloadError(Exception):
     """Exception raised for errors in the S1 SAFE conversion format on AWS."""
@@ -42,6 +59,8 @@ class AWSEOBucket(EOBucket):
         "copernicus-dem-90m",
     ]
 
+    _DOWNLOAD_TRANSFER_CONFIG = _AWS_DOWNLOAD_TRANSFER_CONFIG
+
     def __init__(self, arn_suffix: str) -> None:
         """Base contructor for bucket of EO public data on AWS
 
@@ -64,6 +83,11 @@ try to continue with other authentifcation methods!"
             )
         if arn_suffix in self._SUPPORTED_BUCKET:
             super().__init__(arn_suffix)
+            logger.debug(
+                "Downloads from %s use the %s transfer client",
+                arn_suffix,
+                _AWS_TRANSFER_CLIENT,
+            )
         else:
             raise ValueError("Bucket is not supported!")
 
@@ -253,13 +277,49 @@ class AWSS2Bucket(AWSEOBucket):
                         ExtraArgs=dict(RequestPayer="requester"),
                     )
                 else:
-                    super()._download_prd(prd_prefix, out_prod, request_payer=True, prd_items=prd_items)
-                    super()._download_prd(tile_prefix, out_tile, request_payer=True, prd_items=prd_items)
+                    self._download_prd_pair(
+                        (prd_prefix, out_prod), (tile_prefix, out_tile), prd_items
+                    )
             else:
-                super()._download_prd(prd_prefix, out_tile, request_payer=True)
-                super()._download_prd(tile_prefix, out_prod, request_payer=True)
+                self._download_prd_pair(
+                    (prd_prefix, out_tile),
+                    (tile_prefix, out_prod),
+                )
         return out_dirpath
 
+    def _download_prd_pair(
+        self,
+        prd_part: Tuple[str, Path],
+        tile_part: Tuple[str, Path],
+        prd_items: Optional[List[str]] = None,
+    ) -> None:
+        """Download the product part and the tile part of a S2 product
+            from the AWS buckets
+
+            The two parts are independent prefixes of the bucket, they are downloaded
+            by two workers at the same time. Each part is itself downloaded with
+            concurrent requests by _download_prd. The first error is raised once both
+            downloads are done.
+
+        Args:
+            prd_part (Tuple[str, Path]): prefix and output directory of the product part
+            tile_part (Tuple[str, Path]): prefix and output directory of the tile part
+            prd_items (List[str], optional): Applies a filter on which bands to download
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(
+                    self._download_prd,
+                    prefix,
+                    out_dirpath,
+                    request_payer=True,
+                    prd_items=prd_items,
+                )
+                for prefix, out_dirpath in (prd_part, tile_part)
+            ]
+            for future in futures:
+                future.result()
+
 
 class AWSS2L1CBucket(AWSS2Bucket):
     """Class to handle access to Sentinel-2 L1C data from AWS open data
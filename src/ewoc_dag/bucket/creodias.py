@@ -2,7 +2,6 @@
 """ Creodias DIAS bucket management module
 """
 import logging
-import zipfile
 from pathlib import Path
 from tempfile import gettempdir
 from typing import List
@@ -142,21 +141,11 @@ class CreodiasBucket(EOBucket):
         """
 
         srtm_prefix = "auxdata/SRTMGL1/dem/"
-        for srtm_tile_id in srtm_tile_ids:
-            srtm_tile_id_filename = srtm_tile_id + ".SRTMGL1.hgt.zip"
-            srtm_tile_id_filepath = out_dirpath / srtm_tile_id_filename
-            srtm_object_key = srtm_prefix + srtm_tile_id_filename
-            logger.info(srtm_object_key)
-            self._s3_client.download_file(
-                Bucket=self._bucket_name,
-                Key=srtm_object_key,
-                Filename=str(srtm_tile_id_filepath),
-            )
-
-            with zipfile.ZipFile(srtm_tile_id_filepath, "r") as srtm_zipfile:
-                srtm_zipfile.extractall(out_dirpath)
-
-            srtm_tile_id_filepath.unlink()
+        srtm_object_keys = [
+            srtm_prefix + srtm_tile_id + ".SRTMGL1.hgt.zip"
+            for srtm_tile_id in srtm_tile_ids
+        ]
+        self._download_zip_objects(srtm_object_keys, out_dirpath)
 
     def download_copdem_tiles(
         self,
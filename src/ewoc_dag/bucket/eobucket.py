@@ -1,16 +1,119 @@
 # -*- coding: utf-8 -*-
 """ EO bucket management base module
 """
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import io
 import logging
 from pathlib import Path
+import shutil
 from typing import List, Optional, Tuple
+import zipfile
 
 import boto3
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore import UNSIGNED
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
 
+# Default size of the connection pool of the shared s3 clients
+S3_MAX_POOL_CONNECTIONS = 50
+
+
+@lru_cache(maxsize=16)
+def get_shared_s3_client(
+    s3_access_key_id: Optional[str] = None,
+    s3_secret_access_key: Optional[str] = None,
+    endpoint_url: Optional[str] = None,
+    region_name: Optional[str] = None,
+    signed: bool = True,
+    max_pool_connections: int = S3_MAX_POOL_CONNECTIONS,
+):
+    """Get a s3 client, one client is shared by all the callers with the same
+    arguments to reuse its connection pool (boto3 clients are thread safe)
+
+    Args:
+        s3_access_key_id (str, optional): Access key id of the bucket. Defaults to None.
+        s3_secret_access_key (str, optional): Secret Access_key of the bucket.
+            Defaults to None.
+        endpoint_url (str, optional): Bucket endpoint URL. Defaults to None.
+        region_name (str, optional): Region of the bucket. Defaults to None.
+        signed (bool, optional): Sign the requests, anonymous requests are used for
+            public buckets. Defaults to True.
+        max_pool_connections (int, optional): Size of the connection pool of the client.
+            Defaults to S3_MAX_POOL_CONNECTIONS.
+
+    Returns:
+        s3 client
+    """
+    # Bounded timeouts and retries so a network issue fails fast instead of hanging
+    client_config = Config(
+        max_pool_connections=max_pool_connections,
+        connect_timeout=5,
+        read_timeout=60,
+        retries={"max_attempts": 3, "mode": "standard"},
+        tcp_keepalive=True,
+    )
+    if not signed:
+        client_config = client_config.merge(Config(signature_version=UNSIGNED))
+    # None arguments are ignored by boto3, the default credentials chain is used
+    return boto3.client(
+        "s3",
+        aws_access_key_id=s3_access_key_id,
+        aws_secret_access_key=s3_secret_access_key,
+        endpoint_url=endpoint_url,
+        region_name=region_name,
+        config=client_config,
+    )
+
+
+def make_download_transfer_config(crt: bool = False) -> TransferConfig:
+    """Create the transfer configuration used to download the objects of a product
+
+    Args:
+        crt (bool, optional): Use the CRT transfer client, it requires awscrt.
+            Defaults to False.
+
+    Returns:
+        TransferConfig: transfer configuration
+    """
+    return TransferConfig(
+        max_concurrency=32,
+        use_threads=True,
+        multipart_threshold=8 * 1024 * 1024,
+        # Larger chunks handed to the IO thread: fewer write calls per object
+        io_chunksize=1024 * 1024,
+        preferred_transfer_client="crt" if crt else "auto",
+    )
+
+
+def extract_zip_file(zip_file: zipfile.ZipFile, extract_dirpath: Path) -> None:
+    """Extract the content of a zip file
+
+        A single file archive (e.g. SRTM 1s tiles) is copied with a large buffer into
+        the extract directory, without its inner directories.
+
+    Args:
+        zip_file (zipfile.ZipFile): opened zip file
+        extract_dirpath (Path): directory where to extract the zip file
+    """
+    members = zip_file.infolist()
+    if not members:
+        logger.warning("Empty zip file %s, nothing extracted", zip_file.filename)
+    elif len(members) == 1 and not members[0].is_dir():
+        extract_dirpath.mkdir(parents=True, exist_ok=True)
+        member_filepath = extract_dirpath / Path(members[0].filename).name
+        with zip_file.open(members[0]) as member_file, open(
+            member_filepath, "wb"
+        ) as out_file:
+            shutil.copyfileobj(member_file, out_file, 1024 * 1024)
+    else:
+        zip_file.extractall(extract_dirpath)
+
+
 class UploadFileError(Exception):
     """Exception raised when file upload failed"""
 
@@ -73,6 +176,23 @@ class EOBucket:
     """Base class to describe the access (download, upload and list)
     to a bucket which contains EO data."""
 
+    _UPLOAD_MAX_WORKERS = 20
+    _DOWNLOAD_MAX_WORKERS = 16
+    _UPLOAD_TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=4,
+        use_threads=True,
+    )
+    _DOWNLOAD_TRANSFER_CONFIG = make_download_transfer_config()
+    # Each upload worker can transfer the parts of a file concurrently: the pool
+    # holds a connection for every part in flight
+    _MAX_POOL_CONNECTIONS = max(
+        _UPLOAD_MAX_WORKERS * _UPLOAD_TRANSFER_CONFIG.max_concurrency,
+        _DOWNLOAD_TRANSFER_CONFIG.max_concurrency,
+        _DOWNLOAD_MAX_WORKERS,
+    )
+
     def __init__(
         self,
         bucket_name: str,
@@ -88,19 +208,12 @@ class EOBucket:
             s3_secret_access_key (str, optional): Secret Access_key of the bucket. Defaults to None.
             endpoint_url (str, optional): Bucket endpoint URL. Defaults to None.
         """
-        if (
-            s3_access_key_id is None
-            and s3_secret_access_key is None
-            and endpoint_url is None
-        ):
-            self._s3_client = boto3.client("s3")
-        else:
-            self._s3_client = boto3.client(
-                "s3",
-                aws_access_key_id=s3_access_key_id,
-                aws_secret_access_key=s3_secret_access_key,
-                endpoint_url=endpoint_url,
-            )
+        self._s3_client = get_shared_s3_client(
+            s3_access_key_id,
+            s3_secret_access_key,
+            endpoint_url,
+            max_pool_connections=self._MAX_POOL_CONNECTIONS,
+        )
 
         self._bucket_name = bucket_name
 
@@ -284,6 +397,9 @@ class EOBucket:
     ) -> None:
         """Download product from object storage
 
+            The objects of the product are listed first, then downloaded concurrently
+            thanks to a transfer manager which shares the s3 client connection pool.
+
         Args:
             prd_prefix (str): prd key prefix
             out_dirpath (Path): directory where to write the objects of the product
@@ -293,66 +409,109 @@ class EOBucket:
         logger.debug("Product prefix: %s", prd_prefix)
 
         extra_args = None
-        kwargs = {"Bucket": self._bucket_name, "Prefix": prd_prefix, "MaxKeys": 1000}
+        kwargs = {
+            "Bucket": self._bucket_name,
+            "Prefix": prd_prefix,
+            "PaginationConfig": {"PageSize": 1000},
+        }
         if request_payer:
             extra_args = dict(RequestPayer="requester")
             kwargs.update(extra_args)
 
-        while True:
-            response = self._s3_client.list_objects_v2(**kwargs)
-
+        # Keep only the key and the size of the listed objects
+        key_sizes = {}
+        for response in self._s3_client.get_paginator("list_objects_v2").paginate(
+            **kwargs
+        ):
             try:
-                for obj in response["Contents"]:
-                    # Should we use select this object?
-                    is_selected = prd_items is None
-                    if prd_items is not None:
-                        for filter_band in prd_items:
-                            if filter_band in obj["Key"]:
-                                is_selected = True
-                    if obj["Key"].endswith("/"):
-                        is_file = False
-                    else:
-                        is_file = True
-
-                    if is_selected and is_file:
-                        logger.debug("obj.key: %s", obj["Key"])
-                        filename = obj["Key"].split(
-                            sep="/", maxsplit=len(prd_prefix.split("/")) - 1
-                        )[-1]
-                        output_filepath = out_dirpath / filename
-                        (output_filepath.parent).mkdir(parents=True, exist_ok=True)
-                        if not output_filepath.exists():
-                            logger.info(
-                                "Try to download from %s to %s",
-                                obj["Key"],
-                                output_filepath,
-                            )
-                            self._s3_client.download_file(
-                                Bucket=self._bucket_name,
-                                Key=obj["Key"],
-                                Filename=str(output_filepath),
-                                ExtraArgs=extra_args,
-                            )
-                            logger.info(
-                                "Download from %s to %s succeed!",
-                                obj["Key"],
-                                output_filepath,
-                            )
-                        else:
-                            logger.info(
-                                "%s already available, skip downloading!",
-                                output_filepath,
-                            )
+                key_sizes.update(
+                    (obj["Key"], obj["Size"]) for obj in response["Contents"]
+                )
             except KeyError as exc:
                 raise EOBucketException(
                     prd_prefix, response, self._bucket_name
                 ) from exc
 
+        file_keys = [key for key in key_sizes if not key.endswith("/")]
+        if prd_items is not None:
+            file_keys = [
+                key
+                for key in file_keys
+                if any(filter_band in key for filter_band in prd_items)
+            ]
+
+        objects_to_download = []
+        prefix_depth = len(prd_prefix.split("/")) - 1
+        for key in file_keys:
+            logger.debug("obj.key: %s", key)
+            filename = key.split(sep="/", maxsplit=prefix_depth)[-1]
+            output_filepath = out_dirpath / filename
+            (output_filepath.parent).mkdir(parents=True, exist_ok=True)
+            # The listing already gives the size, so a complete file from a
+            # previous run is skipped without any extra request
             try:
-                kwargs["ContinuationToken"] = response["NextContinuationToken"]
-            except KeyError:
-                logger.debug("No more page!")
-                break
+                is_complete = output_filepath.stat().st_size == key_sizes[key]
+            except FileNotFoundError:
+                is_complete = False
+            if is_complete:
+                logger.info(
+                    "%s already available, skip downloading!",
+                    output_filepath,
+                )
+            else:
+                objects_to_download.append((key, output_filepath))
+
+        with create_transfer_manager(
+            self._s3_client, self._DOWNLOAD_TRANSFER_CONFIG
+        ) as transfer_manager:
+            futures = []
+            for key, output_filepath in objects_to_download:
+                logger.info("Try to download from %s to %s", key, output_filepath)
+                futures.append(
+                    (
+                        key,
+                        output_filepath,
+                        transfer_manager.download(
+                            self._bucket_name,
+                            key,
+                            str(output_filepath),
+                            extra_args=extra_args,
+                        ),
+                    )
+                )
+            for key, output_filepath, future in futures:
+                future.result()
+                logger.info("Download from %s to %s succeed!", key, output_filepath)
+
+    def _download_zip_objects(
+        self, object_keys: List[str], extract_dirpath: Path
+    ) -> None:
+        """Download zip objects and extract their content
+
+            The zip objects are read in memory then extracted, no temporary zip file is
+            written. The objects are independent so they are processed concurrently.
+
+        Args:
+            object_keys (List[str]): keys of the zip objects
+            extract_dirpath (Path): directory where to extract the zip files
+        """
+
+        def download_zip_object(object_key: str) -> None:
+            logger.info(
+                "Try to download %s/%s to %s",
+                self._s3_basepath(),
+                object_key,
+                extract_dirpath,
+            )
+            response = self._s3_client.get_object(
+                Bucket=self._bucket_name, Key=object_key
+            )
+            with zipfile.ZipFile(io.BytesIO(response["Body"].read())) as zip_file:
+                extract_zip_file(zip_file, extract_dirpath)
+
+        with ThreadPoolExecutor(max_workers=self._DOWNLOAD_MAX_WORKERS) as executor:
+            # Consume the results to raise the first error
+            list(executor.map(download_zip_object, object_keys))
 
     def _upload_file(self, filepath: Path, key: str) -> int:
         """Upload a object to a bucket
@@ -373,7 +532,12 @@ class EOBucket:
                 filepath,
                 "s3://" + self._bucket_name + "/" + key,
             )
-            self._s3_client.upload_file(str(filepath), self._bucket_name, key)
+            self._s3_client.upload_file(
+                str(filepath),
+                self._bucket_name,
+                key,
+                Config=self._UPLOAD_TRANSFER_CONFIG,
+            )
         except ClientError as err:
             raise UploadFileError(err, filepath, self._bucket_name, key) from None
 
@@ -398,17 +562,23 @@ class EOBucket:
             paths = sorted(prd_dirpath.rglob("*"))
         else:
             paths = sorted(prd_dirpath.rglob("*" + file_suffix))
-        upload_object_size = 0
-        nb_filepath = len(paths)
-        for path in paths:
-            if path.is_dir():
-                nb_filepath -= 1
-                continue
-            filepath = path
-            key = object_prefix + "/" + str(filepath.relative_to(prd_dirpath))
+        filepaths = [path for path in paths if not path.is_dir()]
+        nb_filepath = len(filepaths)
+        keys = [
+            object_prefix + "/" + str(filepath.relative_to(prd_dirpath))
+            for filepath in filepaths
+        ]
+        # The s3 client is thread safe, the workers share its connection pool
+        with ThreadPoolExecutor(max_workers=self._UPLOAD_MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(self._upload_file, filepath, key)
+                for filepath, key in zip(filepaths, keys)
+            ]
             try:
-                upload_object_size += self._upload_file(filepath, key)
+                upload_object_size = sum(future.result() for future in futures)
             except UploadFileError as err:
+                for future in futures:
+                    future.cancel()
                 raise UploadProductError(err, prd_dirpath, object_prefix) from err
 
         logger.info(
@@ -423,5 +593,5 @@ class EOBucket:
         return (
             nb_filepath,
             upload_object_size,
-            "s3://" + self.bucket_name + "/" + "/".join(key.split("/")[:-1]),
+            "s3://" + self.bucket_name + "/" + "/".join(keys[-1].split("/")[:-1]),
         )
@@ -3,7 +3,6 @@
 """
 import logging
 import os
-import zipfile
 from datetime import datetime
 from distutils.util import strtobool
 from pathlib import Path
@@ -116,7 +115,9 @@ class EWOCBucket(EOBucket):
         return prds_key
 
     def close(self):
-        self._s3_client.close()
+        """Kept for compatibility: the s3 client is shared by all the buckets with the
+        same credentials and endpoint, so it is not closed here to keep it usable by
+        the other buckets"""
 
 
 class EWOCAuxDataBucket(EWOCBucket):
@@ -137,27 +138,12 @@ class EWOCAuxDataBucket(EWOCBucket):
             out_dirpath (Path, optional): Output directry to write SRTM tiles.
                 Defaults to Path(gettempdir()).
         """
-        for srtm_tile_id in srtm_tile_ids:
-            srtm_tile_id_filename = srtm_tile_id + ".SRTMGL1.hgt.zip"
-            srtm_tile_id_filepath = out_dirpath / srtm_tile_id_filename
-            srtm_object_key = "srtm30/" + srtm_tile_id_filename
-            out_dirpath.mkdir(exist_ok=True)
-            _logger.info(
-                "Try to download %s/%s to %s",
-                self._s3_basepath(),
-                srtm_object_key,
-                srtm_tile_id_filepath,
-            )
-            self._s3_client.download_file(
-                Bucket=self._bucket_name,
-                Key=srtm_object_key,
-                Filename=str(srtm_tile_id_filepath),
-            )
-
-            with zipfile.ZipFile(srtm_tile_id_filepath, "r") as srtm_zipfile:
-                srtm_zipfile.extractall(out_dirpath)
-
-            srtm_tile_id_filepath.unlink()
+        out_dirpath.mkdir(exist_ok=True)
+        srtm_object_keys = [
+            "srtm30/" + srtm_tile_id + ".SRTMGL1.hgt.zip"
+            for srtm_tile_id in srtm_tile_ids
+        ]
+        self._download_zip_objects(srtm_object_keys, out_dirpath)
 
     def download_srtm3s_tiles(
         self, srtm_tile_ids: List[str], out_dirpath: Path = Path(gettempdir())
@@ -169,24 +155,10 @@ class EWOCAuxDataBucket(EWOCBucket):
             out_dirpath (Path, optional): Output directry to write SRTM tiles.
                 Defaults to Path(gettempdir()).
         """
-
-        for srtm_tile_id in srtm_tile_ids:
-            srtm_tile_id_filename = srtm_tile_id + ".zip"
-            srtm_tile_id_filepath = out_dirpath / srtm_tile_id_filename
-            srtm_object_key = "srtm90/" + srtm_tile_id_filename
-            _logger.info(
-                "Try to download %s to %s", srtm_object_key, srtm_tile_id_filepath
-            )
-            self._s3_client.download_file(
-                Bucket=self._bucket_name,
-                Key=srtm_object_key,
-                Filename=str(srtm_tile_id_filepath),
-            )
-
-            with zipfile.ZipFile(srtm_tile_id_filepath, "r") as srtm_zipfile:
-                srtm_zipfile.extractall(out_dirpath / "srtm3s")
-
-            srtm_tile_id_filepath.unlink()
+        srtm_object_keys = [
+            "srtm90/" + srtm_tile_id + ".zip" for srtm_tile_id in srtm_tile_ids
+        ]
+        self._download_zip_objects(srtm_object_keys, out_dirpath / "srtm3s")
 
     def _list_agera5_prd(self) -> Set[str]:
         """list all AgERA5 products inside the AUX data bucket
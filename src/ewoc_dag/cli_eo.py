@@ -2,6 +2,7 @@
 """ CLI to retrieve EO data identifiy by their product ID to EO data provider.
 """
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 from pathlib import Path
 import sys
@@ -23,6 +24,8 @@ __license__ = "MIT"
 
 logger = logging.getLogger(__name__)
 
+_MAX_CONCURRENT_PRDS = 4
+
 
 class EwocEODagException(Exception):
     """Base Class for ewoc_dag package"""
@@ -108,7 +111,11 @@ def parse_args(args):
         action="version",
         version=f"ewoc_dag {__version__}",
     )
-    parser.add_argument(dest="prd_ids", help="EO product ID")
+    parser.add_argument(
+        dest="prd_ids",
+        help="EO product ID(s), several products are retrieved concurrently",
+        nargs="+",
+    )
     parser.add_argument(
         "-o",
         dest="out_dirpath",
@@ -178,21 +185,40 @@ def main(args):
         args.data_source,
         args.out_dirpath,
     )
-    try:
-        get_eo_data(
-            args.prd_ids,
-            args.out_dirpath,
-            eo_data_source=args.data_source,
-            to_safe=args.to_safe,
-        )
-    except EwocEODagException as exc:
-        logger.error(exc)
-        sys.exit(2)
-    except BaseException as err:
-        logger.error(f"Unexpected {err=}, {type(err)=}")
-        sys.exit(1)
-    else:
-        logger.info("Data %s are available at %s!", args.prd_ids, args.out_dirpath)
+    # Every product is retrieved even if another one fails, the failures are
+    # reported at the end: 2 for EWoC errors, 1 if any error is unexpected
+    exit_code = 0
+    failed_prd_ids = []
+    with ThreadPoolExecutor(
+        max_workers=min(_MAX_CONCURRENT_PRDS, len(args.prd_ids))
+    ) as executor:
+        futures = {
+            executor.submit(
+                get_eo_data,
+                prd_id,
+                args.out_dirpath,
+                eo_data_source=args.data_source,
+                to_safe=args.to_safe,
+            ): prd_id
+            for prd_id in args.prd_ids
+        }
+        for future in as_completed(futures):
+            prd_id = futures[future]
+            try:
+                future.result()
+            except EwocEODagException as exc:
+                logger.error("%s: %s", prd_id, exc)
+                failed_prd_ids.append(prd_id)
+                exit_code = exit_code or 2
+            except Exception as err:  # pylint: disable=broad-except
+                logger.error(f"{prd_id}: Unexpected {err=}, {type(err)=}")
+                failed_prd_ids.append(prd_id)
+                exit_code = 1
+
+    if exit_code:
+        logger.error("Failed to retrieve %s!", failed_prd_ids)
+        sys.exit(exit_code)
+    logger.info("Data %s are available at %s!", args.prd_ids, args.out_dirpath)
 
 
 def run():
@@ -7,10 +7,9 @@ from pathlib import Path
 from tempfile import gettempdir
 from typing import Optional, List
 
-from eotile.eotile_module import main
-
 from ewoc_dag.bucket.creodias import CreodiasBucket
 from ewoc_dag.bucket.aws import AWSCopDEMBucket
+from ewoc_dag.eotile_utils import eotile_main
 
 
 logger = logging.getLogger(__name__)
@@ -102,7 +101,7 @@ def get_copdem_ids(s2_tile_id: str) -> List[str]:
     :param s2 tile_id:
     :return: List of copdem ids
     """
-    res = main(s2_tile_id, dem=True, overlap=True, no_l8=True, no_s2=True)
+    res = eotile_main(s2_tile_id, dem=True, overlap=True, no_l8=True, no_s2=True)
     return list(res[2].id)
 
 
@@ -1,10 +1,25 @@
 from datetime import datetime
+import re
+
+# Well formed datatake sensing start time (YYYYmmddTHHMMSS)
+_DATETIME_RE = re.compile(r"\d{8}T\d{6}")
 
 
 class S2PrdIdInfo:
 
     FORMAT_DATETIME = "%Y%m%dT%H%M%S"
 
+    __slots__ = (
+        "_s2_prd_id",
+        "_mission_id",
+        "_product_level",
+        "_datatake_sensing_start_time",
+        "_pdgs_processing_baseline_number",
+        "_relative_orbit_number",
+        "_tile_id",
+        "_product_discriminator",
+    )
+
     def __init__(self, s2_prd_id) -> None:
         # S2A_MSIL1C_20170105T013442_N0204_R031_T53NMJ_20170105T013443.SAFE
         # https://sentinels.copernicus.eu/web/sentinel/user-guides/sentinel-2-msi/naming-convention
@@ -82,9 +97,20 @@ class S2PrdIdInfo:
 
     @datatake_sensing_start_time.setter
     def datatake_sensing_start_time(self, value):
-        self._datatake_sensing_start_time = datetime.strptime(
-            value, self.FORMAT_DATETIME
-        )
+        if _DATETIME_RE.fullmatch(value):
+            # Build the datetime from the fixed positions, much cheaper than strptime
+            self._datatake_sensing_start_time = datetime(
+                int(value[0:4]),
+                int(value[4:6]),
+                int(value[6:8]),
+                int(value[9:11]),
+                int(value[11:13]),
+                int(value[13:15]),
+            )
+        else:
+            self._datatake_sensing_start_time = datetime.strptime(
+                value, self.FORMAT_DATETIME
+            )
 
     @property
     def product_level(self):
@@ -1,26 +1,88 @@
 # -*- coding: utf-8 -*-
 """ EODAG utilities to retrieve EO data based on their Produc ID
 """
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from hashlib import sha1
 import logging
 import os
+from pathlib import Path
+import random
+import time
+from uuid import uuid4
 
 from eodag import EODataAccessGateway
 
 logger = logging.getLogger(__name__)
 
+_SEARCH_CACHE_DIRPATH = Path(
+    os.getenv(
+        "EWOC_EODAG_SEARCH_CACHE_DIR",
+        Path.home() / ".cache" / "ewoc_dag" / "eodag_search",
+    )
+)
+# Time to live of the cached search results in seconds, 0 disables the cache.
+# The cache is opt-in: it is only enabled when its directory or TTL is set
+_SEARCH_CACHE_TTL = int(
+    os.getenv(
+        "EWOC_EODAG_SEARCH_CACHE_TTL",
+        "86400" if "EWOC_EODAG_SEARCH_CACHE_DIR" in os.environ else "0",
+    )
+)
+# Maximum random delay in seconds between the first download submissions
+_SUBMIT_JITTER = 0.5
 
-def get_product_by_id(
-    product_id, out_dir, provider=None, config_file=None, product_type=None
-):
+
+class EodagDownloadError(Exception):
+    """Exception raised when some products of a bulk download failed"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.message = "Error while downloading with eodag:"
+        super().__init__(self.message)
+
+    def __str__(self):
+        details = ", ".join(f"{prd_id} ({error})" for prd_id, error in self.failures)
+        return f"{self.message} {details}"
+
+
+def _search(dag, **search_kwargs):
     """
-    Get satellite product with id using eodag
-    :param product_id: id like S2A_MSIL1C_20200518T135121_N0209_R024_T21HTC_20200518T153019
-    :param out_dir: Ouput directory
-    :param provider: This is your data provider needed by eodag, could be different from
-        the cloud provider
+    Search products with eodag, when enabled the results are cached on disk to
+    avoid the same remote search when a workflow is run again
+    :param dag: eodag gateway used for the search
+    :param search_kwargs: Search parameters given to eodag
+    :return: eodag search result
+    """
+    if _SEARCH_CACHE_TTL <= 0:
+        return dag.search(**search_kwargs)[0]
+
+    cache_key = sha1(repr(sorted(search_kwargs.items())).encode()).hexdigest()
+    cache_filepath = _SEARCH_CACHE_DIRPATH / f"{cache_key}.geojson"
+    try:
+        if time.time() - cache_filepath.stat().st_mtime < _SEARCH_CACHE_TTL:
+            logger.debug("Use cached search results %s", cache_filepath)
+            return dag.deserialize_and_register(str(cache_filepath))
+    except FileNotFoundError:
+        pass
+
+    products, _ = dag.search(**search_kwargs)
+    if products:
+        _SEARCH_CACHE_DIRPATH.mkdir(parents=True, exist_ok=True)
+        # Write then rename to not expose a partial file to concurrent runs
+        tmp_filepath = cache_filepath.with_suffix(f".{uuid4().hex}.tmp")
+        dag.serialize(products, filename=str(tmp_filepath))
+        os.replace(tmp_filepath, cache_filepath)
+    return products
+
+
+def _get_dag(provider=None, config_file=None):
+    """
+    Create the eodag gateway with the preferred provider set
+    :param provider: This is your data provider needed by eodag, if none provided the
+        provider will be selected from env vars
     :param config_file: Credentials for eodag, if none provided the credentials will be selected
         from env vars
-    :param product_type: Product type, extra arg for eodag useful for creodias
+    :return: eodag gateway and its provider
     """
     if config_file is None:
         dag = EODataAccessGateway()
@@ -29,16 +91,37 @@ def get_product_by_id(
     if provider is None:
         provider = os.getenv("EWOC_EODAG_PROVIDER")
     dag.set_preferred_provider(provider)
+    return dag, provider
+
+
+def _download_product(dag, product_id, out_dir, provider, product_type=None):
+    """
+    Search and download one satellite product with an eodag gateway
+    :param dag: eodag gateway, it can be shared between threads
+    :param product_id: id like S2A_MSIL1C_20200518T135121_N0209_R024_T21HTC_20200518T153019
+    :param out_dir: Ouput directory
+    :param provider: Data provider used for the search
+    :param product_type: Product type, extra arg for eodag useful for creodias
+    """
     if product_type is not None:
-        products, _ = dag.search(
-            id=product_id, provider=provider, productType=product_type
+        products = _search(
+            dag, id=product_id, provider=provider, productType=product_type
         )
     else:
-        products, _ = dag.search(id=product_id, provider=provider)
+        products = _search(dag, id=product_id, provider=provider)
     if not products:
         logging.error("No results return by eodag!")
         raise ValueError("No results return by eodag!")
-    out_prd_path = dag.download(products[0], outputs_prefix=out_dir)
+    # The search may also return neighbouring products, only download the requested one
+    wanted = [prd for prd in products if prd.properties.get("id") == product_id]
+    if wanted:
+        product = wanted[0]
+    else:
+        logger.warning(
+            "No search result matches exactly %s, download the first one", product_id
+        )
+        product = products[0]
+    out_prd_path = dag.download(product, outputs_prefix=out_dir)
     # delete zip file
     list_out = os.listdir(out_dir)
     for item in list_out:
@@ -46,3 +129,76 @@ def get_product_by_id(
             os.remove(os.path.join(out_dir, item))
 
     return out_prd_path
+
+
+def get_product_by_id(
+    product_id, out_dir, provider=None, config_file=None, product_type=None
+):
+    """
+    Get satellite product with id using eodag
+    :param product_id: id like S2A_MSIL1C_20200518T135121_N0209_R024_T21HTC_20200518T153019
+    :param out_dir: Ouput directory
+    :param provider: This is your data provider needed by eodag, could be different from
+        the cloud provider
+    :param config_file: Credentials for eodag, if none provided the credentials will be selected
+        from env vars
+    :param product_type: Product type, extra arg for eodag useful for creodias
+    """
+    dag, provider = _get_dag(provider, config_file)
+    return _download_product(
+        dag, product_id, out_dir, provider, product_type=product_type
+    )
+
+
+def get_products_by_id(
+    product_ids,
+    out_dir,
+    provider=None,
+    config_file=None,
+    product_type=None,
+    max_workers=8,
+):
+    """
+    Get several satellite products with their ids using eodag, downloads are done in parallel
+    :param product_ids: List of ids like S2A_MSIL1C_20200518T135121_N0209_R024_T21HTC_20200518T153019
+    :param out_dir: Ouput directory
+    :param provider: This is your data provider needed by eodag, could be different from
+        the cloud provider
+    :param config_file: Credentials for eodag, if none provided the credentials will be selected
+        from env vars
+    :param product_type: Product type, extra arg for eodag useful for creodias
+    :param max_workers: Number of products downloaded at the same time
+    :return: List of (product_id, output path or exception) tuples, a failed product
+        does not abort the other downloads
+    """
+    # One gateway, with its configuration and sessions, for all the downloads
+    dag, provider = _get_dag(provider, config_file)
+
+    def download_product(product_id, delay):
+        # The delay is spent in the worker, the submissions are not held back
+        if delay > 0:
+            time.sleep(delay)
+        return _download_product(
+            dag, product_id, out_dir, provider, product_type=product_type
+        )
+
+    outcomes = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for index, product_id in enumerate(product_ids):
+            # Stagger the first wave so the provider does not see a burst of
+            # searches and downloads, the following ones start as workers free up
+            delay = 0
+            if 0 < index < max_workers:
+                delay = random.uniform(0, _SUBMIT_JITTER)
+            future = executor.submit(download_product, product_id, delay)
+            futures[future] = product_id
+        for future in as_completed(futures):
+            product_id = futures[future]
+            try:
+                outcomes.append((product_id, future.result()))
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error("Download of %s failed: %s", product_id, exc)
+                outcomes.append((product_id, exc))
+
+    return outcomes
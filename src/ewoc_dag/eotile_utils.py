@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+""" EOTile utilities to find the tiles which overlap a S2 tile
+"""
+from copy import deepcopy
+from functools import lru_cache
+
+from eotile.eotile_module import main
+
+
+def eotile_main(tile_id, **kwargs):
+    """
+    Run eotile for a tile id, the results are cached by tile id and options
+    :param tile_id: S2 tile id
+    :param kwargs: eotile options (dem, srtm5x5, overlap, no_l8, no_s2, ...)
+    :return: List of GeoDataFrames, copies of the cached ones so they can be modified
+    """
+    return deepcopy(_eotile_main(tile_id, **kwargs))
+
+
+@lru_cache(maxsize=1024)
+def _eotile_main(tile_id, **kwargs):
+    return main(tile_id, **kwargs)
@@ -24,14 +24,13 @@ def l2a_to_ard(product_id, work_dir):
         "SCL": 20,
     }
     # Prepare ewoc folder name
-    platform = product_id.split("_")[0]
-    processing_level = product_id.split("_")[1]
-    date = product_id.split("_")[2]
+    parts = product_id.split("_")
+    platform, processing_level, date = parts[0], parts[1], parts[2]
     year = date[:4]
     # Get tile id , remove the T in the beginning
-    tile_id = product_id.split("_")[5][1:]
+    tile_id = parts[5][1:]
     atcor_algo = "L2A"
-    unique_id = "".join(product_id.split("_")[3:6])
+    unique_id = "".join(parts[3:6])
     folder_st = os.path.join(
         work_dir,
         "OPTICAL",
@@ -39,7 +38,7 @@ def l2a_to_ard(product_id, work_dir):
         tile_id[2],
         tile_id[3:],
         year,
-        date.split("T")[0],
+        date.partition("T")[0],
     )
     dir_name = f"{platform}_{processing_level}_{date}_{unique_id}_{tile_id}"
 
@@ -55,21 +54,20 @@ def l2a_to_ard(product_id, work_dir):
 
 def l8_to_ard(key,s2_tile,out_dir=None):
     product_id = os.path.split(key)[-1]
-    platform = product_id.split('_')[0]
-    processing_level = product_id.split('_')[1]
-    date = product_id.split('_')[3]
+    parts = product_id.split('_')
+    platform, processing_level, date = parts[0], parts[1], parts[3]
     year = date[:4]
     # Get tile id , remove the T in the beginning
     tile_id = s2_tile
-    unique_id = f"{product_id.split('_')[2]}{product_id.split('_')[5]}{product_id.split('_')[6]}"
-    folder_st = os.path.join('TIR', tile_id[:2], tile_id[2], tile_id[3:], year,date.split('T')[0])
+    unique_id = f"{parts[2]}{parts[5]}{parts[6]}"
+    folder_st = os.path.join('TIR', tile_id[:2], tile_id[2], tile_id[3:], year,
+                             date.partition('T')[0])
     dir_name = f"{platform}_{processing_level}_{date}_{unique_id}_{tile_id}"
     out_name = f"{platform}_{processing_level}_{date}_{unique_id}_{tile_id}"
     raster_fn = os.path.join(folder_st, dir_name, out_name)
     if out_dir is not None:
         tmp = os.path.join(out_dir, folder_st, dir_name)
-        if not os.path.exists(tmp):
-            os.makedirs(tmp)
+        os.makedirs(tmp, exist_ok=True)
     return raster_fn
 
 
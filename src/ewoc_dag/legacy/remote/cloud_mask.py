@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from boto3.s3.transfer import TransferConfig
+
+# Cloud masks above 8 MiB are fetched as parallel ranged GETs of 8 MiB
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+)
+
+
+class Cloud_Mask:
+    """
+    Base of the remote cloud mask objects, the subclasses implement
+    mask_exists and download_aws for their bucket layout
+    """
+
+    def __init__(self, bucket=None, prefix=None, provider="aws", payer=None):
+        """
+
+        :param bucket: AWS bucket of the products, Optional
+        :type bucket: str
+        :param prefix: AWS prefix of the products, Optional
+        :type prefix: str
+        :param payer: Who is paying for the check and download
+        :type payer: str
+        """
+        self.exists = False
+        # Set once mask_exists has run, download reuses its result
+        self._checked = False
+        self.provider = provider
+        self.bucket = bucket
+        self.prefix = prefix
+        self.payer = payer
+
+    @classmethod
+    def batch_exists(cls, specs, max_workers=16):
+        """
+        Check several cloud masks at the same time, the s3 client is shared
+        :param specs: Constructor arguments of each cloud mask ex (tile, date)
+        :type specs: list
+        :param max_workers: Number of checks done at the same time
+        :type max_workers: int
+        :return: Cloud mask object of each spec, checked with mask_exists
+        :rtype: dict
+        """
+        masks = {spec: cls(*spec) for spec in specs}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(lambda mask: mask.mask_exists(), masks.values()))
+        return masks
+
+    @classmethod
+    def batch_download(cls, out_files, masks=None, max_workers=16):
+        """
+        Download several cloud masks at the same time, the s3 client is shared
+        :param out_files: Path where to copy the cloud mask of each spec
+            ex {(tile, date): out_file}
+        :type out_files: dict
+        :param masks: Cloud mask object of each spec returned by batch_exists, they
+            are reused instead of being checked again
+        :type masks: dict
+        :param max_workers: Number of downloads done at the same time
+        :type max_workers: int
+        :return: True if the cloud mask of the spec is downloaded else False
+        :rtype: dict
+        """
+        if masks is None:
+            masks = {}
+
+        def download(spec):
+            mask = masks.get(spec)
+            if mask is None:
+                mask = cls(*spec)
+            return mask.download(out_files[spec])
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(download, out_files)
+            return dict(zip(out_files, results))
+
+    def check_once(self):
+        """
+        Check if the cloud mask exists, mask_exists is only run if it did not run yet
+        :return: True if the cloud mask exists
+        :rtype: bool
+        """
+        if not self._checked:
+            self.mask_exists()
+        return self.exists
+
+    def mask_exists(self):
+        """
+        Check if cloud mask exists for a given provider
+        """
+        raise NotImplementedError
+
+    def download_aws(self, out_file):
+        """
+        Download cloud mask to local storage
+        :param out_file: Path where to copy the cloud mask
+        :type out_file: str
+        :return: True if success else return False
+        :rtype: bool
+        """
+        raise NotImplementedError
+
+    def download(self, out_file):
+        """
+        Download cloud mask
+        :param out_file: Path where to copy the cloud mask
+        :type out_file: str
+        :return: True if success else return False
+        :rtype: bool
+        """
+        if self.provider == "aws":
+            return self.download_aws(out_file)
+        else:
+            # Add more download methods for other providers or local folders
+            # returns false for now
+            return False
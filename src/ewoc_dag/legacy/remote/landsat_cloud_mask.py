@@ -1,7 +1,8 @@
-import boto3
+from ewoc_dag.bucket.eobucket import get_shared_s3_client
+from ewoc_dag.legacy.remote.cloud_mask import TRANSFER_CONFIG, Cloud_Mask
 
 
-class Landsat_Cloud_Mask:
+class Landsat_Cloud_Mask(Cloud_Mask):
     """
     Landsat cloud mask object, the main goal of this class is to check
     if a remote cloud mask is available and download it
@@ -32,16 +33,12 @@ class Landsat_Cloud_Mask:
         :param payer: Who is paying for the check and download
         :type payer: str
         """
-        self.exists = False
+        super().__init__(bucket, prefix, provider, payer)
         self.cloud_key = None
         self.tirs_10_key = None
-        self.provider = provider
         self.path = path
         self.row = row
         self.date = date
-        self.bucket = bucket
-        self.prefix = prefix
-        self.payer = payer
 
     def mask_exists(self):
         """
@@ -52,26 +49,31 @@ class Landsat_Cloud_Mask:
                 self.bucket = "usgs-landsat"
             if self.prefix is None:
                 self.prefix = "collection02/level-2/standard/oli-tirs/"
-            s3 = boto3.client("s3")
-            file_keys = []
+            s3 = get_shared_s3_client()
             year = self.date[:4]
             prod_dir = "{}/{}/{}/".format(year, self.path, self.row)
-            response = s3.list_objects_v2(
+            # Scenes are listed in lexical order: start right before the LC08 scene
+            # of the date and stop at the first match instead of listing the year
+            pages = s3.get_paginator("list_objects_v2").paginate(
                 Bucket=self.bucket,
                 Prefix=self.prefix + prod_dir,
-                MaxKeys=1000,
+                StartAfter=f"{self.prefix}{prod_dir}LC08_L2SP_{self.path}{self.row}_{self.date}",
                 RequestPayer=self.payer,
                 Delimiter='/',
+                PaginationConfig={"PageSize": 1000},
             )
-            resp = response["CommonPrefixes"]
-            for prefix in resp:
-                file_keys.append(prefix["Prefix"])
-            cloud_mask = [
-                file for file in file_keys if self.date in file.split('/')[7].split('_')[3]
-            ]
-            if len(cloud_mask) > 0:
-                self.cloud_key = cloud_mask[0]+cloud_mask[0].split('/')[7]+'_SR_QA_AEROSOL.TIF'
-                self.tirs_10_key = cloud_mask[0]+cloud_mask[0].split('/')[7]+'_ST_B10.TIF'
+            cloud_mask = None
+            for page in pages:
+                for prefix in page.get("CommonPrefixes", []):
+                    if self.date in prefix["Prefix"].split('/')[7].split('_')[3]:
+                        cloud_mask = prefix["Prefix"]
+                        break
+                if cloud_mask is not None:
+                    break
+            self._checked = True
+            if cloud_mask is not None:
+                self.cloud_key = cloud_mask+cloud_mask.split('/')[7]+'_SR_QA_AEROSOL.TIF'
+                self.tirs_10_key = cloud_mask+cloud_mask.split('/')[7]+'_ST_B10.TIF'
                 self.exists = True
                 return True
             else:
@@ -89,29 +91,14 @@ class Landsat_Cloud_Mask:
         :return: True if success else return False
         :rtype: bool
         """
-        s3 = boto3.resource("s3")
-        if self.mask_exists():
-            s3_object = s3.Object(self.bucket, self.cloud_key)
-            resp = s3_object.get(RequestPayer="requester")
-            with open(out_file, "wb") as f:
-                for chunk in iter(lambda: resp["Body"].read(4096), b""):
-                    f.write(chunk)
+        if self.check_once():
+            get_shared_s3_client().download_file(
+                Bucket=self.bucket,
+                Key=self.cloud_key,
+                Filename=out_file,
+                ExtraArgs={"RequestPayer": "requester"},
+                Config=TRANSFER_CONFIG,
+            )
             return True
 
         return False
-
-    def download(self, out_file):
-        """
-        Download cloud mask
-        :param out_file: Path where to copy the cloud mask
-        :type out_file: str
-        :return: True if success else return False
-        :rtype: bool
-        """
-        if self.provider == "aws":
-            self.download_aws(out_file)
-            return True
-        else:
-            # Add more download methods for other providers or local folders
-            # returns false for now
-            return False
@@ -1,10 +1,14 @@
 import re
-import boto3
-from botocore import UNSIGNED
-from botocore.config import Config
 
+from ewoc_dag.bucket.eobucket import get_shared_s3_client
+from ewoc_dag.legacy.remote.cloud_mask import TRANSFER_CONFIG, Cloud_Mask
 
-class Sentinel_Cloud_Mask:
+# S2 MGRS tile id split into UTM zone, latitude band and grid square
+# (31TCJ -> 31, T, CJ)
+_TILE_ID_RE = re.compile(r"(\d+)([a-zA-Z])([a-zA-Z]+)")
+
+
+class Sentinel_Cloud_Mask(Cloud_Mask):
     """
     Sentinel cloud mask object, the main goal of this class is to check
     if a remote cloud mask is available and download it
@@ -32,14 +36,10 @@ class Sentinel_Cloud_Mask:
         :param payer: Who is paying for the check and download
         :type payer: str
         """
-        self.exists = False
+        super().__init__(bucket, prefix, provider, payer)
         self.tile = tile
         self.key = None
-        self.provider = provider
         self.date = date
-        self.bucket = bucket
-        self.prefix = prefix
-        self.payer = payer
 
     def mask_exists(self):
         """
@@ -55,31 +55,33 @@ class Sentinel_Cloud_Mask:
             year = self.date[:4]
             month = self.date[4:6]
             month = month.replace("0", "") if month[0] == "0" else month
-            tile_digit = re.findall("\d+", self.tile)[0]
-            tile_alpha = re.findall("[a-zA-Z]", self.tile)
+            tile_match = _TILE_ID_RE.fullmatch(self.tile)
+            if tile_match is None:
+                raise ValueError(f"{self.tile} is not a valid Sentinel-2 tile id!")
+            tile_digit, latitude_band, grid_square = tile_match.groups()
             prod_dir = "{}/{}/{}/{}/{}/".format(
-                tile_digit, tile_alpha[0], "".join(tile_alpha[1:]), year, month
+                tile_digit, latitude_band, grid_square, year, month
+            )
+            # Only the product folders of the month are needed, not their files
+            list_kwargs = dict(
+                Bucket=self.bucket,
+                Prefix=self.prefix + prod_dir,
+                MaxKeys=100,
+                Delimiter="/",
             )
             response = {}
-            if self.payer is "requester":
-                s3 = boto3.client("s3")
-                response = s3.list_objects_v2(
-                    Bucket=self.bucket,
-                    Prefix=self.prefix + prod_dir,
-                    MaxKeys=100,
-                    RequestPayer=self.payer,
-                )
+            if self.payer == "requester":
+                s3 = get_shared_s3_client(signed=True)
+                response = s3.list_objects_v2(**list_kwargs, RequestPayer=self.payer)
             elif self.payer is None:
-                s3 = boto3.client("s3", config=Config(signature_version=UNSIGNED))
-                response = s3.list_objects_v2(
-                    Bucket=self.bucket, Prefix=self.prefix + prod_dir, MaxKeys=100,Delimiter="/",
-                )
-            resp = response["CommonPrefixes"]
-            for prefix in resp:
+                s3 = get_shared_s3_client(signed=False)
+                response = s3.list_objects_v2(**list_kwargs)
+            for prefix in response.get("CommonPrefixes", []):
                 file_keys.append(prefix["Prefix"])
             cloud_mask = [
                 file for file in file_keys if self.date in file
             ]
+            self._checked = True
             if len(cloud_mask) == 1:
                 self.key = cloud_mask[0]+'SCL.tif'
                 self.exists = True
@@ -99,36 +101,24 @@ class Sentinel_Cloud_Mask:
         :rtype: bool
         """
 
-        if self.mask_exists():
+        if self.check_once():
             if self.payer == "requester":
-                s3 = boto3.resource("s3")
-                s3_object = s3.Object(self.bucket, self.key)
-                resp = s3_object.get(RequestPayer="requester")
+                get_shared_s3_client(signed=True).download_file(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Filename=out_file,
+                    ExtraArgs={"RequestPayer": "requester"},
+                    Config=TRANSFER_CONFIG,
+                )
             elif self.payer is None:
-
-
-                s3 = boto3.resource("s3", config=Config(signature_version=UNSIGNED))
-                s3_object = s3.Object(self.bucket, self.key)
-                resp = s3_object.get()
-            with open(out_file, "wb") as f:
-                for chunk in iter(lambda: resp["Body"].read(4096), b""):
-                    f.write(chunk)
-            return True
-        else:
-            return False
-
-    def download(self, out_file):
-        """
-        Download cloud mask
-        :param out_file: Path where to copy the cloud mask
-        :type out_file: str
-        :return: True if success else return False
-        :rtype: bool
-        """
-        if self.provider == "aws":
-            self.download_aws(out_file)
+                get_shared_s3_client(signed=False).download_file(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Filename=out_file,
+                    Config=TRANSFER_CONFIG,
+                )
+            else:
+                return False
             return True
         else:
-            # Add more download methods for other providers or local folders
-            # returns false for now
             return False
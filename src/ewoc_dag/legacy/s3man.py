@@ -1,33 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
+import posixpath
 from pathlib import Path
 
-import boto3
-import botocore
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
+from ewoc_dag.bucket.eobucket import get_shared_s3_client
+
 logger = logging.getLogger(__name__)
 
+# Files bigger than the threshold are transferred as concurrent parts
+_TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024,
+                                  multipart_chunksize=8 * 1024 * 1024,
+                                  max_concurrency=10)
+# Downloads use larger parts fetched with parallel ranged GETs
+_DOWNLOAD_TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024,
+                                           multipart_chunksize=16 * 1024 * 1024,
+                                           max_concurrency=min(16, (os.cpu_count() or 1) * 2),
+                                           use_threads=True)
+
 
 # Some s3 functions from argo workflow coded by Alex G.
 def get_s3_client():
-    client_config = botocore.config.Config(max_pool_connections=100)
-    s3_client = None
-    if "amazon" in os.environ["S3_ENDPOINT"]:
-        s3_client = boto3.client('s3',
-                                 aws_access_key_id=os.environ["S3_ACCESS_KEY_ID"],
-                                 aws_secret_access_key=os.environ["S3_SECRET_ACCESS_KEY"],
-                                 region_name="eu-central-1",
-                                 config=client_config)
-    if "cloudferro" in os.environ["S3_ENDPOINT"]:
-        s3_client = boto3.client('s3',
-                                 aws_access_key_id=os.environ["S3_ACCESS_KEY_ID"],
-                                 aws_secret_access_key=os.environ["S3_SECRET_ACCESS_KEY"],
-                                 endpoint_url=os.environ["S3_ENDPOINT"],
-                                 config=client_config)
-
-    return s3_client
+    """Return the s3 client of the endpoint set by the S3_ENDPOINT env variable
 
+    The client is built once per endpoint and credentials, then reused: boto3 low-level
+    clients are thread safe and share their connection pool between calls. The credentials
+    are read at each call, rotated ones give a new client.
+    """
+    endpoint = os.environ["S3_ENDPOINT"]
+    # The credentials are only needed, and read, for the supported endpoints
+    if "amazon" in endpoint:
+        return get_shared_s3_client(os.environ["S3_ACCESS_KEY_ID"],
+                                    os.environ["S3_SECRET_ACCESS_KEY"],
+                                    region_name="eu-central-1")
+    if "cloudferro" in endpoint:
+        return get_shared_s3_client(os.environ["S3_ACCESS_KEY_ID"],
+                                    os.environ["S3_SECRET_ACCESS_KEY"],
+                                    endpoint_url=endpoint)
+    return None
 
 
 def upload_object(bucket, filepath: Path, object_name: str)-> bool:
@@ -42,7 +55,7 @@ def upload_object(bucket, filepath: Path, object_name: str)-> bool:
         [bool]: if upload succeed
     """
     try:
-        bucket.upload_file(filepath, object_name)
+        bucket.upload_file(filepath, object_name, Config=_TRANSFER_CONFIG)
         logging.info('Uploaded %s (%s) to %s', filepath, filepath.stat().st_size, object_name)
     except ClientError as e:
         logging.error(e)
@@ -52,44 +65,64 @@ def upload_object(bucket, filepath: Path, object_name: str)-> bool:
 
 def upload_file(s3_client, local_file, bucket, s3_obj):
     try:
-        s3_client.upload_file(local_file, bucket, s3_obj)
-        print("Sent {} to s3://{}/{}".format(local_file, bucket, s3_obj))
+        s3_client.upload_file(local_file, bucket, s3_obj, Config=_TRANSFER_CONFIG)
+        logger.info("Sent %s to s3://%s/%s", local_file, bucket, s3_obj)
     except ClientError:
-        print("Failed to upload file {} to s3://{}/{}".format(local_file, bucket, s3_obj))
+        logger.error("Failed to upload file %s to s3://%s/%s", local_file, bucket, s3_obj)
         return False
     return True
 
 
-def recursive_upload_dir_to_s3(s3_client, local_path, s3_path, bucketname):
-    tif_files_number = 0
-    total_output_size = 0
-    paths = []
-    for (root, dir_names, filenames) in os.walk(local_path):
-        for file in filenames:
-            old_file = os.path.join(root, file)
-            if os.path.isfile(old_file):
-                if file.endswith('.tif'):
-                    tif_files_number += 1
-                new_file = os.path.join(s3_path, root.replace(local_path, ''), file)
-                total_output_size = total_output_size + os.path.getsize(old_file)
-                upload_file(s3_client, old_file, bucketname, new_file)
-                if os.path.dirname(new_file) not in paths:
-                    paths.append(os.path.dirname(new_file))
+def scan_files(dirpath):
+    """Yield recursively the DirEntry of the files under dirpath
+
+    The file type comes from the directory listing itself, so only one stat is needed
+    per file to get its size.
+    """
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
+
+def recursive_upload_dir_to_s3(s3_client, local_path, s3_path, bucketname, max_workers=16):
+    upload_tasks = []
+    for entry in scan_files(local_path):
+        # S3 keys are posix paths whatever the local os
+        rel_path = os.path.relpath(entry.path, local_path)
+        new_file = posixpath.join(s3_path, *rel_path.split(os.sep))
+        upload_tasks.append((entry.path, new_file, entry.stat().st_size))
+
+    # The boto3 client is thread safe: share it (and its connection pool) between the workers
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda task: upload_file(s3_client, task[0], bucketname, task[1]),
+                          upload_tasks))
+
+    tif_files_number = sum(1 for old_file, _, _ in upload_tasks if old_file.endswith('.tif'))
+    total_output_size = sum(size for _, _, size in upload_tasks)
+    paths = {posixpath.dirname(new_file) for _, new_file, _ in upload_tasks}
     if len(paths) == 1:
-        print(f'\n Uploaded {tif_files_number} tif files to bucket | s3://{bucketname}/{paths[0]}')
+        logger.info('Uploaded %s tif files to bucket | s3://%s/%s',
+                    tif_files_number, bucketname, next(iter(paths)))
     else:
-        print("Error, incorrect number of directories : ")
-        print(f'\n Uploaded {tif_files_number} tif files to bucket | s3://{bucketname}/{f" ; s3://{bucketname}/".join(paths)}')
+        logger.error('Incorrect number of directories, uploaded %s tif files to bucket | %s',
+                     tif_files_number,
+                     " ; ".join(f"s3://{bucketname}/{path}" for path in sorted(paths)))
     return tif_files_number, total_output_size
 
 
-def download_s3file(s3_full_key,out_file, bucket):
+def download_s3file(s3_full_key,out_file, bucket, s3_client=None):
     """
     Download file from s3 object storage
     :param s3_full_key: Object full path (prefix, and key)
     :param out_file: Full path and name of the output file
     :param bucket: Bucket name
+    :param s3_client: s3 client to use, defaults to the one of get_s3_client
     """
-    s3_client = get_s3_client()
+    if s3_client is None:
+        s3_client = get_s3_client()
     s3_client.download_file(Bucket=bucket, Key=s3_full_key, Filename=out_file,
-                            ExtraArgs=dict(RequestPayer='requester'))
+                            ExtraArgs=dict(RequestPayer='requester'),
+                            Config=_DOWNLOAD_TRANSFER_CONFIG)
@@ -1,19 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
 import logging
 import os
+from pathlib import Path
 import re
 
-import boto3
-
-from eotile.eotile_module import main
-import numpy as np
-import rasterio
-
-from ewoc_dag.eodag_utils import get_product_by_id
+from ewoc_dag.bucket.eobucket import get_shared_s3_client
+from ewoc_dag.eodag_utils import EodagDownloadError, get_products_by_id
+from ewoc_dag.eotile_utils import eotile_main
+from ewoc_dag.legacy import s3man
+# The L2A to ARD conversion is shared with ewoc_dag.utils, kept importable from here
+from ewoc_dag.utils import (  # pylint: disable=unused-import
+    binary_scl,
+    find_l2a_bands,
+    l2a_to_ard,
+    raster_to_ard,
+)
 
 logger = logging.getLogger(__name__)
 
+# Acquisition date (YYYYmmdd) followed by the time in S1/S2 product ids
+_DATE_RE = re.compile(r"(?<=_)\d{8}(?=T)")
+
 
 def get_geom_from_id(tile_id):
     """
@@ -21,7 +30,7 @@ def get_geom_from_id(tile_id):
     :param tile_id: S2 tile id
     :return: GeoDataFrame with the footprint geometry
     """
-    res = main(tile_id)
+    res = eotile_main(tile_id)
     return res[0]
 
 
@@ -31,7 +40,7 @@ def get_bounds(tile_id):
     :param tile_id: S2 tile id
     :return: Bounds coordinates
     """
-    res = main(tile_id)
+    res = eotile_main(tile_id)
     UL0 = list(res[0]["UL0"])[0]
     UL1 = list(res[0]["UL1"])[0]
     # Return LL, UR tuple
@@ -50,20 +59,15 @@ def get_dates_from_prod_id(product_id):
     sat_name = pid[0]
     sensor = ""
     if "S1" in sat_name:
-        res = re.search(r"(?<=\_)(\d){8}(?=T)", product_id)
-        date_tmp = res.group()
+        date_tmp = _DATE_RE.search(product_id).group()
         sensor = "S1"
     elif "S2" in sat_name:
-        res = re.search(r"(?<=\_)(\d){8}(?=T)", product_id)
-        date_tmp = res.group()
+        date_tmp = _DATE_RE.search(product_id).group()
         sensor = "S2"
     elif "LC08" in sat_name:
         sensor = "L8"
         date_tmp = pid[3]
-    year = int(date_tmp[:4])
-    month = int(date_tmp[4:6])
-    day = int(date_tmp[6:8])
-    date = datetime(year, month, day)
+    date = datetime.strptime(date_tmp[:8], "%Y%m%d")
     start_date = date - timedelta(days=1)
     end_date = date + timedelta(days=1)
     return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"), sensor
@@ -81,12 +85,7 @@ def download_s3file(s3_full_key, out_file, bucket):
     product_id = os.path.split(s3_full_key)[-1]
     band_num = "_".join(product_id.split("_")[7:9])
     out_file += "_" + band_num
-    s3 = boto3.resource("s3")
-    object = s3.Object(bucket, key)
-    resp = object.get(RequestPayer="requester")
-    with open(out_file, "wb") as f:
-        for chunk in iter(lambda: resp["Body"].read(4096), b""):
-            f.write(chunk)
+    s3man.download_s3file(key, out_file, bucket, s3_client=get_shared_s3_client())
 
 
 def get_l8_rasters(data_folder):
@@ -94,12 +93,11 @@ def get_l8_rasters(data_folder):
     Find Landsat 8 rasters
     :param data_folder: Input folder (any level)
     """
-    l8_rasters = []
-    for root, dirs, files in os.walk(data_folder):
-        for file in files:
-            if file.endswith((".tif", ".TIF")) and "LC08" in file:
-                l8_rasters.append(os.path.join(root, file))
-    return l8_rasters
+    return [
+        entry.path
+        for entry in s3man.scan_files(data_folder)
+        if entry.name.endswith((".tif", ".TIF")) and "LC08" in entry.name
+    ]
 
 
 def copy_tirs_s3(s3_full_key, out_dir, s2_tile):
@@ -111,14 +109,15 @@ def copy_tirs_s3(s3_full_key, out_dir, s2_tile):
     :return:
     """
     product_id = os.path.split(s3_full_key)[-1]
-    platform = product_id.split("_")[0]
-    processing_level = product_id.split("_")[1]
-    date = product_id.split("_")[3]
+    parts = product_id.split("_")
+    platform = parts[0]
+    processing_level = parts[1]
+    date = parts[3]
     year = date[:4]
     # Get tile id , remove the T in the beginning
     tile_id = s2_tile
     out_dir = os.path.join(out_dir, "TIR")
-    unique_id = f"{product_id.split('_')[2]}{product_id.split('_')[5]}{product_id.split('_')[6]}"
+    unique_id = f"{parts[2]}{parts[5]}{parts[6]}"
     folder_st = os.path.join(
         out_dir, tile_id[:2], tile_id[2], tile_id[3:], year, date.split("T")[0]
     )
@@ -126,16 +125,40 @@ def copy_tirs_s3(s3_full_key, out_dir, s2_tile):
     out_name = f"{platform}_{processing_level}_{date}_{unique_id}_{tile_id}"
     raster_fn = os.path.join(folder_st, dir_name, out_name)
     tmp = os.path.join(folder_st, dir_name)
-    if not os.path.exists(tmp):
-        os.makedirs(tmp)
+    os.makedirs(tmp, exist_ok=True)
     bucket = "usgs-landsat"
-    download_s3file(s3_full_key, raster_fn, bucket)
     qa_key = s3_full_key.replace("ST_B10", "ST_QA")
-    download_s3file(qa_key, raster_fn, bucket)
+    # Both bands are independent, download them at the same time with the shared client
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(download_s3file, key, raster_fn, bucket)
+            for key in (s3_full_key, qa_key)
+        ]
+        for future in futures:
+            future.result()
     # TODO Use logger instead
     print("Done for TIRS copy")
 
 
+def copy_tirs_s3_batch(s3_full_keys, out_dir, s2_tile, max_workers=8):
+    """
+    Copy the L8 Thermal bands of several products from S3 bucket
+    :param s3_full_keys: Objects full path (bucket name, prefix, and key) of the ST_B10 bands
+    :param out_dir: Output directory
+    :param s2_tile: S2 tile id
+    :param max_workers: Number of products copied at the same time
+    """
+    # Each product download is mostly waiting on the network, fan them out
+    # on threads sharing the cached s3 client
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(copy_tirs_s3, s3_full_key, out_dir, s2_tile)
+            for s3_full_key in s3_full_keys
+        ]
+        for future in futures:
+            future.result()
+
+
 def get_prods_from_json(json_file, out_dir, provider, sat="S2", config_file=None):
     """
     Bulk download using json workplan
@@ -144,26 +167,32 @@ def get_prods_from_json(json_file, out_dir, provider, sat="S2", config_file=None
     :param provider: Data provider (creodias, peps, astraea_eod, ...)
     :param sat: S2/S1 or L8
     :param config_file: eodag config file
+    :raises EodagDownloadError: if some products of the plan failed to be downloaded,
+        the other products are still downloaded
     """
     # Read json plan
     prod_types = {"S2": "S2_PROC", "L8": "L8_PROC", "S1": "SAR_PROC"}
     sat = prod_types[sat]
     with open(json_file) as f:
         plan = json.load(f)
+    failures = []
     for tile in plan:
-        out_dir = os.path.join(out_dir, tile)
-        if not os.path.exists(out_dir):
-            os.makedirs(out_dir)
+        tile_out_dir = os.path.join(out_dir, tile)
+        os.makedirs(tile_out_dir, exist_ok=True)
         if sat == "S2_PROC":
-            prods = plan[tile][sat]["INPUTS"]
-            for prod in prods:
-                get_product_by_id(
-                    prod["id"], out_dir, provider, config_file=config_file
-                )
+            prods = [prod["id"] for prod in plan[tile][sat]["INPUTS"]]
         else:
             prods = plan[tile][sat]["INPUTS"]
-            for prod in prods:
-                get_product_by_id(prod, out_dir, provider, config_file=config_file)
+        outcomes = get_products_by_id(
+            prods, tile_out_dir, provider, config_file=config_file
+        )
+        failures.extend(
+            (prd_id, outcome)
+            for prd_id, outcome in outcomes
+            if isinstance(outcome, Exception)
+        )
+    if failures:
+        raise EodagDownloadError(failures)
 
 
 def find_l2a_band(l2a_folder, band_num, res):
@@ -175,11 +204,8 @@ def find_l2a_band(l2a_folder, band_num, res):
     :return: path to band
     """
     band_path = None
-    id = f"{band_num}_{str(res)}m.jp2"
-    for root, dirs, files in os.walk(l2a_folder):
-        for file in files:
-            if file.endswith(id):
-                band_path = os.path.join(root, file)
+    for path in Path(l2a_folder).rglob(f"*{band_num}_{res}m.jp2"):
+        band_path = str(path)
     return band_path
 
 
@@ -195,144 +221,3 @@ def get_s2_prodname(safe_path):
     prodname = [item for item in safe_split if ".SAFE" in item][0]
     prodname = prodname.replace(".SAFE", "")
     return prodname
-
-
-def raster_to_ard(raster_path, band_num, raster_fn):
-    """
-    Read raster and update internals to fit ewoc ard specs
-    :param raster_path: Path to raster file
-    :param band_num: Band number, B02 for example
-    :param raster_fn: Output raster path
-    """
-    with rasterio.Env(GDAL_CACHEMAX=2048):
-        with rasterio.open(raster_path, "r") as src:
-            raster_array = src.read()
-            meta = src.meta.copy()
-    meta["driver"] = "GTiff"
-    meta["nodata"] = 0
-    bands_10m = ["B02", "B03", "B04", "B08"]
-    blocksize = 512
-    if band_num in bands_10m:
-        blocksize = 1024
-    with rasterio.open(
-        raster_fn,
-        "w+",
-        **meta,
-        tiled=True,
-        compress="deflate",
-        blockxsize=blocksize,
-        blockysize=blocksize,
-    ) as out:
-        out.write(raster_array)
-
-
-def binary_scl(scl_file, raster_fn):
-    """
-    Convert L2A SCL file to binary cloud mask
-    :param scl_file: Path to SCL file
-    :param raster_fn: Output binary mask path
-    """
-    with rasterio.open(scl_file, "r") as src:
-        scl = src.read(1)
-
-    # Set the to-be-masked SCL values
-    SCL_MASK_VALUES = [0, 1, 3, 8, 9, 10, 11]
-
-    # Set the nodata value in SCL
-    SCL_NODATA_VALUE = 0
-
-    # Contruct the final binary 0-1-255 mask
-    mask = np.zeros_like(scl)
-    mask[scl == SCL_NODATA_VALUE] = 255
-    mask[~np.isin(scl, SCL_MASK_VALUES)] = 1
-
-    meta = src.meta.copy()
-    meta["driver"] = "GTiff"
-    dtype = rasterio.uint8
-    meta["dtype"] = dtype
-    meta["nodata"] = 255
-
-    with rasterio.open(
-        raster_fn,
-        "w+",
-        **meta,
-        compress="deflate",
-        tiled=True,
-        blockxsize=512,
-        blockysize=512,
-    ) as out:
-        out.write(mask.astype(rasterio.uint8), 1)
-
-
-def l2a_to_ard(l2a_folder, work_dir, only_scl=False):
-    """
-    Convert an L2A product into EWoC ARD format
-    :param l2a_folder: L2A SAFE folder
-    :param work_dir: Output directory
-    """
-    if only_scl:
-        bands = {
-            "SCL": 20,
-        }
-    else:
-        bands = {
-            "B02": 10,
-            "B03": 10,
-            "B04": 10,
-            "B08": 10,
-            "B05": 20,
-            "B06": 20,
-            "B07": 20,
-            "B11": 20,
-            "B12": 20,
-            "SCL": 20,
-        }
-    # Prepare ewoc folder name
-    prod_name = get_s2_prodname(l2a_folder)
-    product_id = prod_name
-    platform = product_id.split("_")[0]
-    processing_level = product_id.split("_")[1]
-    date = product_id.split("_")[2]
-    year = date[:4]
-    # Get tile id , remove the T in the beginning
-    tile_id = product_id.split("_")[5][1:]
-    atcor_algo = "L2A"
-    unique_id = "".join(product_id.split("_")[3:6])
-    folder_st = os.path.join(
-        work_dir,
-        "OPTICAL",
-        tile_id[:2],
-        tile_id[2],
-        tile_id[3:],
-        year,
-        date.split("T")[0],
-    )
-    dir_name = f"{platform}_{processing_level}_{date}_{unique_id}_{tile_id}"
-    tmp_dir = os.path.join(folder_st, dir_name)
-    ard_folder = os.path.join(folder_st, dir_name)
-    if not os.path.exists(tmp_dir):
-        os.makedirs(tmp_dir)
-
-    # Convert bands and SCL
-    for band in bands:
-        res = bands[band]
-        band_path = find_l2a_band(l2a_folder, band, bands[band])
-        band_name = os.path.split(band_path)[-1]
-        band_name = band_name.replace(".jp2", ".tif").replace(f"_{str(res)}m", "")
-        print("Processing band " + band_name)
-        out_name = f"{platform}_{atcor_algo}_{date}_{unique_id}_{tile_id}_{band}.tif"
-        raster_fn = os.path.join(folder_st, dir_name, out_name)
-        if band == "SCL":
-            out_cld = f"{platform}_{atcor_algo}_{date}_{unique_id}_{tile_id}_MASK.tif"
-            raster_cld = os.path.join(folder_st, dir_name, out_cld)
-            binary_scl(band_path, raster_cld)
-            print("Done --> " + raster_cld)
-            try:
-                os.remove(raster_cld + ".aux.xml")
-            except:
-                print("Clean")
-
-        else:
-            raster_to_ard(band_path, band, raster_fn)
-            print("Done --> " + raster_fn)
-    return ard_folder
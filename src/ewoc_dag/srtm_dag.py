@@ -1,23 +1,32 @@
 # -*- coding: utf-8 -*-
 """ DAG for SRTM 1s and 3s tiles
 """
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
 import logging
 import numpy as np
 import zipfile
 from geopandas import GeoDataFrame
 from pathlib import Path
+import shutil
+from tempfile import TemporaryFile
 from typing import Optional, List
 
 import requests
-from eotile.eotile_module import main
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ewoc_dag.bucket.creodias import CreodiasBucket
+from ewoc_dag.bucket.eobucket import extract_zip_file
 from ewoc_dag.bucket.ewoc import EWOCAuxDataBucket
+from ewoc_dag.eotile_utils import eotile_main
 
 logger = logging.getLogger(__name__)
 
 _SRTM_1S_SOURCES = ["esa", "creodias", "ewoc"]
+_ESA_SRTM_1S_URL = "http://step.esa.int/auxdata/dem/SRTMGL1/"
+_ESA_MAX_WORKERS = 8
 
 
 def get_srtm_1s_default_provider() -> str:
@@ -102,12 +111,59 @@ def get_srtm_from_esa(srtm_tile_ids: List[str], out_dirpath: Path) -> None:
     :param srtm_tile_ids: List of srtm tile ids
     :param out_dirpath: Output directory where the srtm data is downloaded
     """
-    esa_website_root = "http://step.esa.int/auxdata/dem/SRTMGL1/"
-    for srtm_tile_id in srtm_tile_ids:
-        srtm_tile_id_filename = srtm_tile_id + ".SRTMGL1.hgt.zip"
-        srtm_tile_id_url = esa_website_root + srtm_tile_id_filename
+    out_dirpath.mkdir(parents=True, exist_ok=True)
+    session = _get_esa_session()
+    with ThreadPoolExecutor(max_workers=_ESA_MAX_WORKERS) as executor:
+        list(
+            executor.map(
+                lambda srtm_tile_id: _get_srtm_tile_from_esa(
+                    session, srtm_tile_id, out_dirpath
+                ),
+                srtm_tile_ids,
+            )
+        )
+
+
+@lru_cache(maxsize=1)
+def _get_esa_session() -> requests.Session:
+    """
+    Get the HTTP session used for the ESA website, it is created once so the
+    connections are reused between the tiles and the calls. The transient errors
+    of the website are retried.
+    :return: HTTP session
+    """
+    retries = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=_ESA_MAX_WORKERS,
+        pool_maxsize=2 * _ESA_MAX_WORKERS,
+        max_retries=retries,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
-        response = requests.get(srtm_tile_id_url)
+def _get_srtm_tile_from_esa(
+    session: requests.Session, srtm_tile_id: str, out_dirpath: Path
+) -> None:
+    """
+    Retrieve one srtm 1s tile from ESA website into the output dir
+    :param session: HTTP session used to download the tile
+    :param srtm_tile_id: srtm tile id
+    :param out_dirpath: Output directory where the srtm data is downloaded
+    """
+    srtm_tile_id_filename = srtm_tile_id + ".SRTMGL1.hgt.zip"
+    srtm_tile_id_url = _ESA_SRTM_1S_URL + srtm_tile_id_filename
+
+    # The zip is streamed by blocks to an anonymous temporary file, the memory used
+    # does not depend on the tile size
+    with session.get(srtm_tile_id_url, stream=True, timeout=30) as response:
         # pylint: disable=no-member
         if response.status_code != requests.codes.ok:
             logger.error(
@@ -116,18 +172,14 @@ def get_srtm_from_esa(srtm_tile_ids: List[str], out_dirpath: Path) -> None:
                 response.status_code,
                 srtm_tile_id_url,
             )
-            continue
-
-        logger.info("%s downloaded!", srtm_tile_id_filename)
-
-        srtm_tile_id_filepath = out_dirpath / srtm_tile_id_filename
-        with open(srtm_tile_id_filepath, "wb") as srtm_file:
-            srtm_file.write(response.content)
+            return
 
-        with zipfile.ZipFile(srtm_tile_id_filepath, "r") as srtm_zipfile:
-            srtm_zipfile.extractall(out_dirpath)
+        with TemporaryFile() as srtm_file:
+            shutil.copyfileobj(response.raw, srtm_file, length=1024 * 1024)
+            logger.info("%s downloaded!", srtm_tile_id_filename)
 
-        srtm_tile_id_filepath.unlink()
+            with zipfile.ZipFile(srtm_file) as srtm_zipfile:
+                extract_zip_file(srtm_zipfile, out_dirpath)
 
 
 def get_srtm1s_ids(s2_tile_id: str) -> List[str]:
@@ -136,7 +188,7 @@ def get_srtm1s_ids(s2_tile_id: str) -> List[str]:
     :param s2 tile_id:
     :return: List of srtm ids
     """
-    res = main(s2_tile_id, dem=True, overlap=True, no_l8=True, no_s2=True)
+    res = eotile_main(s2_tile_id, dem=True, overlap=True, no_l8=True, no_s2=True)
     return list(res[2].id)
 
 
@@ -148,7 +200,7 @@ def get_srtm3s_ids(s2_tile_id: str, use_sen2cor: bool = True) -> List[str]:
     computed by the sen2cor method to avoid miss srtm3s tiles.
     :return: List of srtm ids
     """
-    res = main(s2_tile_id, srtm5x5=True, overlap=True, no_l8=True, no_s2=True)
+    res = eotile_main(s2_tile_id, srtm5x5=True, overlap=True, no_l8=True, no_s2=True)
     list_srtm3s = list(res[3]["id"].values)
 
     if use_sen2cor:
@@ -164,7 +216,7 @@ def get_srtm3s_ids_using_sen2cor_method(s2_tile_id: str) -> List[str]:
     :param s2 tile_id: S2 MGRS tile id
     :return: List of srtm ids
     """
-    res = main(s2_tile_id)
+    res = eotile_main(s2_tile_id)
 
     res[0] = GeoDataFrame(res[0], crs=res[0].SRS[0], geometry=res[0].geometry)
 
@@ -1,9 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
+from pathlib import Path
+import shutil
+
+import numpy as np
 import rasterio
 
 
-from eotile.eotile_module import main
+from ewoc_dag.eotile_utils import eotile_main
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +19,7 @@ def get_bounds(tile_id):
     :param tile_id: S2 tile id
     :return: Bounds coordinates
     """
-    res = main(tile_id)
+    res = eotile_main(tile_id)
     UL0 = list(res[0]["UL0"])[0]
     UL1 = list(res[0]["UL1"])[0]
     # Return LL, UR tuple
@@ -67,13 +72,14 @@ def l2a_to_ard(l2a_folder, work_dir, only_scl=False):
     dir_name = f"{platform}_{processing_level}_{date}_{unique_id}_{tile_id}"
     tmp_dir = os.path.join(folder_st, dir_name)
     ard_folder = os.path.join(folder_st, dir_name)
-    if not os.path.exists(tmp_dir):
-        os.makedirs(tmp_dir)
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    band_paths = find_l2a_bands(l2a_folder, bands)
 
     # Convert bands and SCL
-    for band in bands:
+    def convert_band(band):
         res = bands[band]
-        band_path = find_l2a_band(l2a_folder, band, bands[band])
+        band_path = band_paths[band]
         band_name = os.path.split(band_path)[-1]
         band_name = band_name.replace(".jp2", ".tif").replace(f"_{str(res)}m", "")
         print("Processing band " + band_name)
@@ -82,7 +88,7 @@ def l2a_to_ard(l2a_folder, work_dir, only_scl=False):
         if band == "SCL":
             out_cld = f"{platform}_{atcor_algo}_{date}_{unique_id}_{tile_id}_MASK.tif"
             raster_cld = os.path.join(folder_st, dir_name, out_cld)
-            binary_scl(band_path, raster_cld)
+            binary_scl(band_path, raster_cld, num_threads=num_threads)
             print("Done --> " + raster_cld)
             try:
                 os.remove(raster_cld + ".aux.xml")
@@ -90,8 +96,16 @@ def l2a_to_ard(l2a_folder, work_dir, only_scl=False):
                 print("Clean")
 
         else:
-            raster_to_ard(band_path, band, raster_fn)
+            raster_to_ard(band_path, band, raster_fn, num_threads=num_threads)
             print("Done --> " + raster_fn)
+
+    # The bands are independent and rasterio releases the GIL while reading and
+    # writing, so they are converted concurrently. Each band then uses a single GDAL
+    # thread to not oversubscribe the CPUs
+    max_workers = min(len(bands), os.cpu_count() or 1)
+    num_threads = 1 if max_workers > 1 else "all_cpus"
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(convert_band, bands))
     return ard_folder
 
 
@@ -109,33 +123,102 @@ def get_s2_prodname(safe_path):
     return prodname
 
 
-def raster_to_ard(raster_path, band_num, raster_fn):
+def _is_ard_raster(src, blocksize):
+    """
+    Check if an opened raster already fits ewoc ard specs
+    :param src: Opened rasterio dataset
+    :param blocksize: Expected block size
+    :return: True if the raster can be copied as is
+    """
+    profile = src.profile
+    return (
+        profile["driver"] == "GTiff"
+        and profile.get("tiled", False)
+        and profile.get("blockxsize") == blocksize
+        and profile.get("blockysize") == blocksize
+        and profile.get("compress") == "deflate"
+        and src.tags(ns="IMAGE_STRUCTURE").get("PREDICTOR") == "2"
+        and src.nodata == 0
+    )
+
+
+def raster_to_ard(raster_path, band_num, raster_fn, num_threads="all_cpus"):
     """
     Read raster and update internals to fit ewoc ard specs
     :param raster_path: Path to raster file
     :param band_num: Band number, B02 for example
     :param raster_fn: Output raster path
+    :param num_threads: Number of GDAL threads used to decode and compress the raster
     """
-    with rasterio.Env(GDAL_CACHEMAX=2048):
-        with rasterio.open(raster_path, "r") as src:
-            raster_array = src.read()
-            meta = src.meta.copy()
-    meta["driver"] = "GTiff"
-    meta["nodata"] = 0
     bands_10m = ["B02", "B03", "B04", "B08"]
     blocksize = 512
     if band_num in bands_10m:
         blocksize = 1024
+    with rasterio.Env(GDAL_CACHEMAX=512, GDAL_NUM_THREADS=num_threads):
+        with rasterio.open(raster_path, "r") as src:
+            if _is_ard_raster(src, blocksize):
+                # Nothing to rewrite, a plain file copy is enough
+                shutil.copyfile(raster_path, raster_fn)
+                return
+            meta = src.meta.copy()
+            meta["driver"] = "GTiff"
+            meta["nodata"] = 0
+            with rasterio.open(
+                raster_fn,
+                "w+",
+                **meta,
+                tiled=True,
+                compress="deflate",
+                predictor=2,
+                zlevel=3,
+                num_threads=num_threads,
+                blockxsize=blocksize,
+                blockysize=blocksize,
+            ) as out:
+                # Copy block by block: only one output block is held in memory
+                for _, window in out.block_windows(1):
+                    out.write(src.read(window=window), window=window)
+
+
+# SCL value -> binary mask value: 255 for nodata (0), 0 for the to-be-masked values
+# (saturated, dark area, cloud shadows, clouds, cirrus and snow) and 1 otherwise
+_SCL_TO_MASK_LUT = np.ones(256, dtype=np.uint8)
+_SCL_TO_MASK_LUT[[1, 3, 8, 9, 10, 11]] = 0
+_SCL_TO_MASK_LUT[0] = 255
+
+
+def binary_scl(scl_file, raster_fn, num_threads="all_cpus"):
+    """
+    Convert L2A SCL file to binary cloud mask
+    :param scl_file: Path to SCL file
+    :param raster_fn: Output binary mask path
+    :param num_threads: Number of GDAL threads used to compress the mask
+    """
+    with rasterio.open(scl_file, "r") as src:
+        mask = np.empty((src.height, src.width), dtype=np.uint8)
+        src.read(1, out=mask)
+
+    # Contruct the final binary 0-1-255 mask in one lookup pass, in place
+    np.take(_SCL_TO_MASK_LUT, mask, out=mask)
+
+    meta = src.meta.copy()
+    meta["driver"] = "GTiff"
+    dtype = rasterio.uint8
+    meta["dtype"] = dtype
+    meta["nodata"] = 255
+
     with rasterio.open(
         raster_fn,
         "w+",
         **meta,
-        tiled=True,
         compress="deflate",
-        blockxsize=blocksize,
-        blockysize=blocksize,
+        zlevel=3,
+        num_threads=num_threads,
+        tiled=True,
+        blockxsize=512,
+        blockysize=512,
     ) as out:
-        out.write(raster_array)
+        out.write(mask, 1)
 
 
 def find_l2a_band(l2a_folder, band_num, res):
@@ -147,9 +230,23 @@ def find_l2a_band(l2a_folder, band_num, res):
     :return: path to band
     """
     band_path = None
-    id = f"{band_num}_{str(res)}m.jp2"
-    for root, dirs, files in os.walk(l2a_folder):
-        for file in files:
-            if file.endswith(id):
-                band_path = os.path.join(root, file)
+    for path in Path(l2a_folder).rglob(f"*{band_num}_{res}m.jp2"):
+        band_path = str(path)
     return band_path
+
+
+def find_l2a_bands(l2a_folder, bands):
+    """
+    Find several L2A bands with a single scan of the product folder
+    :param l2a_folder: L2A product folder
+    :param bands: dict of band (BXX/AOT/SCL/...) and resolution (10/20/60)
+    :return: dict of band and path to band, None if the band is not found
+    """
+    band_suffixes = {band: f"{band}_{res}m.jp2" for band, res in bands.items()}
+    band_paths = dict.fromkeys(bands)
+    for path in Path(l2a_folder).rglob("*.jp2"):
+        for band, band_suffix in band_suffixes.items():
+            if path.name.endswith(band_suffix):
+                band_paths[band] = str(path)
+                break
+    return band_paths
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Base test case of the tests run against a moto mocked s3"""
+
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+
+import boto3
+from moto import mock_aws
+
+_FAKE_AWS_ENV = {
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_DEFAULT_REGION": "us-east-1",
+}
+
+
+class MockS3TestCase(unittest.TestCase):
+    """Start a mocked s3 with fake credentials and a temporary directory for
+    each test"""
+
+    def setUp(self):
+        env_patcher = mock.patch.dict(os.environ, _FAKE_AWS_ENV)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        aws_mock = mock_aws()
+        aws_mock.start()
+        self.addCleanup(aws_mock.stop)
+        self.s3_client = boto3.client("s3")
+
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dirpath = Path(tmp_dir.name)
+
+    def record_params(self, s3_client, operation, param):
+        """Record a parameter of each call of an operation done by a s3 client
+
+        Args:
+            s3_client: s3 client which does the calls
+            operation (str): name of the operation, e.g. GetObject
+            param (str): name of the recorded parameter, None when it is not set
+
+        Returns:
+            list: recorded values, filled while the test runs
+        """
+        values = []
+
+        def record_param(params, **kwargs):
+            values.append(params.get(param))
+
+        # The s3 clients are shared between the tests, remove the handler afterwards
+        event_name = f"provide-client-params.s3.{operation}"
+        s3_client.meta.events.register(event_name, record_param)
+        self.addCleanup(s3_client.meta.events.unregister, event_name, record_param)
+        return values
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Test remote cloud mask modules"""
+
+import os
+from pathlib import Path
+
+from mock_s3_testcase import MockS3TestCase
+
+from ewoc_dag.bucket.eobucket import get_shared_s3_client
+from ewoc_dag.legacy.remote.landsat_cloud_mask import Landsat_Cloud_Mask
+from ewoc_dag.legacy.remote.sentinel_cloud_mask import Sentinel_Cloud_Mask
+
+_S2_PRD_DIR = "sentinel-s2-l2a-cogs/31/T/CJ/2020/1/"
+_L8_PRD_DIR = "collection02/level-2/standard/oli-tirs/2020/198/030/"
+_L8_PRD_NAME = "LC08_L2SP_198030_20200101_20200823_02_T1"
+
+
+class Test_cloud_mask(MockS3TestCase):
+    def setUp(self):
+        super().setUp()
+        self.s3_client.create_bucket(Bucket="sentinel-cogs")
+        for prd_name in ["S2A_31TCJ_20200105_0_L2A", "S2B_31TCJ_20200110_0_L2A"]:
+            for filename in ["SCL.tif", "B02.tif", "B03.tif"]:
+                # Anonymous requests need public objects
+                self.s3_client.put_object(
+                    Bucket="sentinel-cogs",
+                    Key=f"{_S2_PRD_DIR}{prd_name}/{filename}",
+                    Body=filename.encode(),
+                    ACL="public-read",
+                )
+        self.s3_client.create_bucket(Bucket="usgs-landsat")
+        for suffix in ["_SR_QA_AEROSOL.TIF", "_ST_B10.TIF"]:
+            self.s3_client.put_object(
+                Bucket="usgs-landsat",
+                Key=f"{_L8_PRD_DIR}{_L8_PRD_NAME}/{_L8_PRD_NAME}{suffix}",
+                Body=suffix.encode(),
+            )
+
+    def test_sentinel_mask_exists(self):
+        for payer in [None, "requester"]:
+            cloud_mask = Sentinel_Cloud_Mask("31TCJ", "20200105", payer=payer)
+            self.assertTrue(cloud_mask.mask_exists())
+            self.assertEqual(
+                cloud_mask.key, f"{_S2_PRD_DIR}S2A_31TCJ_20200105_0_L2A/SCL.tif"
+            )
+
+    def test_sentinel_mask_not_exists(self):
+        cloud_mask = Sentinel_Cloud_Mask("31TCJ", "20200107")
+        self.assertFalse(cloud_mask.mask_exists())
+        self.assertIsNone(cloud_mask.key)
+        self.assertFalse(Sentinel_Cloud_Mask("31TCK", "20200105").mask_exists())
+
+    def test_sentinel_invalid_tile(self):
+        for tile in ["TCJ", "31-TCJ", ""]:
+            with self.assertRaises(ValueError):
+                Sentinel_Cloud_Mask(tile, "20200105").mask_exists()
+
+    def test_sentinel_batch(self):
+        specs = [("31TCJ", "20200105"), ("31TCJ", "20200107"), ("31TCJ", "20200110")]
+        masks = Sentinel_Cloud_Mask.batch_exists(specs)
+        self.assertEqual(
+            {spec: mask.exists for spec, mask in masks.items()},
+            {specs[0]: True, specs[1]: False, specs[2]: True},
+        )
+
+        list_calls = self.record_params(
+            get_shared_s3_client(signed=False), "ListObjectsV2", "Prefix"
+        )
+        out_files = {spec: str(self.tmp_dirpath / f"{spec[1]}.tif") for spec in specs}
+        self.assertEqual(
+            Sentinel_Cloud_Mask.batch_download(out_files, masks=masks),
+            {specs[0]: True, specs[1]: False, specs[2]: True},
+        )
+        # The checked masks are reused, the bucket is not listed again
+        self.assertEqual(list_calls, [])
+        self.assertEqual(Path(out_files[specs[0]]).read_bytes(), b"SCL.tif")
+        self.assertFalse(Path(out_files[specs[1]]).exists())
+
+    def test_landsat_batch(self):
+        specs = [("198", "030", "20200101"), ("198", "030", "20200117")]
+        masks = Landsat_Cloud_Mask.batch_exists(specs)
+        self.assertEqual(
+            masks[specs[0]].cloud_key,
+            f"{_L8_PRD_DIR}{_L8_PRD_NAME}/{_L8_PRD_NAME}_SR_QA_AEROSOL.TIF",
+        )
+        self.assertFalse(masks[specs[1]].exists)
+
+        out_files = {spec: str(self.tmp_dirpath / f"{spec[2]}.tif") for spec in specs}
+        # Without the checked masks, each one is checked before its download
+        self.assertEqual(
+            Landsat_Cloud_Mask.batch_download(out_files),
+            {specs[0]: True, specs[1]: False},
+        )
+        self.assertEqual(Path(out_files[specs[0]]).read_bytes(), b"_SR_QA_AEROSOL.TIF")
+
+    def test_sentinel_download_ranged(self):
+        # Above the 8 MiB threshold the mask is fetched as ranged GETs of 8 MiB
+        scl = os.urandom(20 * 1024 * 1024)
+        self.s3_client.put_object(
+            Bucket="sentinel-cogs",
+            Key=f"{_S2_PRD_DIR}S2A_31TCJ_20200105_0_L2A/SCL.tif",
+            Body=scl,
+            ACL="public-read",
+        )
+        get_object_ranges = self.record_params(
+            get_shared_s3_client(signed=False), "GetObject", "Range"
+        )
+        out_filepath = self.tmp_dirpath / "SCL.tif"
+        cloud_mask = Sentinel_Cloud_Mask("31TCJ", "20200105")
+        self.assertTrue(cloud_mask.download(str(out_filepath)))
+        self.assertEqual(len(get_object_ranges), 3)
+        self.assertTrue(all(get_object_ranges))
+        self.assertEqual(out_filepath.read_bytes(), scl)
+
+    def test_landsat_download_small(self):
+        get_object_ranges = self.record_params(
+            get_shared_s3_client(), "GetObject", "Range"
+        )
+        out_filepath = self.tmp_dirpath / "QA_AEROSOL.TIF"
+        cloud_mask = Landsat_Cloud_Mask("198", "030", "20200101")
+        self.assertTrue(cloud_mask.download(str(out_filepath)))
+        # Below the threshold, a single GET is done
+        self.assertEqual(get_object_ranges, [None])
+        self.assertEqual(out_filepath.read_bytes(), b"_SR_QA_AEROSOL.TIF")
+
+    def test_sentinel_requester_payer_value(self):
+        # A payer built at runtime (e.g. read from a config) is not the interned
+        # "requester" literal, it must still select the requester pays listing
+        payer = "".join(["request", "er"])
+        list_calls = self.record_params(
+            get_shared_s3_client(signed=True), "ListObjectsV2", "Prefix"
+        )
+        cloud_mask = Sentinel_Cloud_Mask("31TCJ", "20200105", payer=payer)
+        self.assertTrue(cloud_mask.mask_exists())
+        self.assertEqual(list_calls, [_S2_PRD_DIR])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Test EO bucket management module"""
+
+import unittest
+
+from mock_s3_testcase import MockS3TestCase
+
+from ewoc_dag.bucket.eobucket import EOBucket
+
+
+class Test_eobucket(MockS3TestCase):
+    _BUCKET_NAME = "test-eo-bucket"
+    _PRD_PREFIX = "tiles/31/T/CJ/S2B_MSIL1C_20210714T131719.SAFE/"
+
+    def setUp(self):
+        super().setUp()
+        s3_client = self.s3_client
+        s3_client.create_bucket(Bucket=self._BUCKET_NAME)
+        for band in ["B02", "B03", "B04"]:
+            s3_client.put_object(
+                Bucket=self._BUCKET_NAME,
+                Key=f"{self._PRD_PREFIX}GRANULE/IMG_DATA/{band}.jp2",
+                Body=band.encode() * 100,
+            )
+        s3_client.put_object(
+            Bucket=self._BUCKET_NAME, Key=f"{self._PRD_PREFIX}AUX_DATA/", Body=b""
+        )
+
+        self.out_dirpath = self.tmp_dirpath
+        self.eo_bucket = EOBucket(self._BUCKET_NAME)
+
+    def test_download_prd(self):
+        self.eo_bucket._download_prd(self._PRD_PREFIX, self.out_dirpath)
+        img_dirpath = self.out_dirpath / "GRANULE" / "IMG_DATA"
+        self.assertEqual(
+            sorted(path.name for path in img_dirpath.iterdir()),
+            ["B02.jp2", "B03.jp2", "B04.jp2"],
+        )
+        self.assertEqual((img_dirpath / "B02.jp2").read_bytes(), b"B02" * 100)
+
+    def test_download_prd_items(self):
+        self.eo_bucket._download_prd(
+            self._PRD_PREFIX, self.out_dirpath, prd_items=["B03"]
+        )
+        img_dirpath = self.out_dirpath / "GRANULE" / "IMG_DATA"
+        self.assertEqual([path.name for path in img_dirpath.iterdir()], ["B03.jp2"])
+
+    def test_download_prd_resume(self):
+        self.eo_bucket._download_prd(self._PRD_PREFIX, self.out_dirpath)
+        truncated_filepath = self.out_dirpath / "GRANULE" / "IMG_DATA" / "B04.jp2"
+        truncated_filepath.write_bytes(b"B04")
+
+        get_object_keys = self.record_params(
+            self.eo_bucket._s3_client, "GetObject", "Key"
+        )
+        self.eo_bucket._download_prd(self._PRD_PREFIX, self.out_dirpath)
+        # Only the incomplete file is downloaded again
+        self.assertEqual(
+            set(get_object_keys), {f"{self._PRD_PREFIX}GRANULE/IMG_DATA/B04.jp2"}
+        )
+        self.assertEqual(truncated_filepath.read_bytes(), b"B04" * 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
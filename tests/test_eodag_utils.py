@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+""" Test EODAG utilities module
+"""
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import time
+import unittest
+from unittest import mock
+
+from ewoc_dag import eodag_utils
+
+
+def _fake_dag():
+    dag = mock.MagicMock()
+    dag.search.return_value = (["S2B_MSIL1C_20210714T131719"], 1)
+
+    def serialize(products, filename):
+        Path(filename).write_text(repr(products), encoding="utf-8")
+
+    dag.serialize.side_effect = serialize
+    dag.deserialize_and_register.return_value = ["cached"]
+    return dag
+
+
+class Test_eodag_utils(unittest.TestCase):
+    _SEARCH_KWARGS = {"id": "S2B_MSIL1C_20210714T131719", "provider": "creodias"}
+
+    def setUp(self):
+        self._tmp_dir = TemporaryDirectory()
+        self.addCleanup(self._tmp_dir.cleanup)
+        dir_patcher = mock.patch.object(
+            eodag_utils, "_SEARCH_CACHE_DIRPATH", Path(self._tmp_dir.name)
+        )
+        dir_patcher.start()
+        self.addCleanup(dir_patcher.stop)
+
+    def test_search_cache_disabled(self):
+        dag = _fake_dag()
+        with mock.patch.object(eodag_utils, "_SEARCH_CACHE_TTL", 0):
+            eodag_utils._search(dag, **self._SEARCH_KWARGS)
+            eodag_utils._search(dag, **self._SEARCH_KWARGS)
+        self.assertEqual(dag.search.call_count, 2)
+        self.assertEqual(os.listdir(self._tmp_dir.name), [])
+
+    def test_search_cache_hit(self):
+        dag = _fake_dag()
+        with mock.patch.object(eodag_utils, "_SEARCH_CACHE_TTL", 60):
+            self.assertEqual(
+                eodag_utils._search(dag, **self._SEARCH_KWARGS),
+                ["S2B_MSIL1C_20210714T131719"],
+            )
+            self.assertEqual(
+                eodag_utils._search(dag, **self._SEARCH_KWARGS), ["cached"]
+            )
+        self.assertEqual(dag.search.call_count, 1)
+        self.assertEqual(len(os.listdir(self._tmp_dir.name)), 1)
+
+    def test_search_cache_expired(self):
+        dag = _fake_dag()
+        with mock.patch.object(eodag_utils, "_SEARCH_CACHE_TTL", 60):
+            eodag_utils._search(dag, **self._SEARCH_KWARGS)
+            (cache_filepath,) = Path(self._tmp_dir.name).iterdir()
+            expired_time = time.time() - 120
+            os.utime(cache_filepath, (expired_time, expired_time))
+            eodag_utils._search(dag, **self._SEARCH_KWARGS)
+        self.assertEqual(dag.search.call_count, 2)
+        dag.deserialize_and_register.assert_not_called()
+        self.assertGreater(cache_filepath.stat().st_mtime, expired_time)
+
+    def test_search_cache_empty_result(self):
+        dag = _fake_dag()
+        dag.search.return_value = ([], 0)
+        with mock.patch.object(eodag_utils, "_SEARCH_CACHE_TTL", 60):
+            eodag_utils._search(dag, **self._SEARCH_KWARGS)
+        self.assertEqual(os.listdir(self._tmp_dir.name), [])
+
+    def test_get_product_by_id_matching_result(self):
+        prd_id = "S2B_MSIL1C_20210714T131719_N0301_R124_T28PBC_20210714T152157"
+        neighbour = mock.MagicMock(
+            properties={"id": prd_id.replace("T28PBC", "T28PBB")}
+        )
+        wanted = mock.MagicMock(properties={"id": prd_id})
+        dag = mock.MagicMock()
+        dag.download.return_value = "/tmp/" + prd_id
+        with mock.patch.object(
+            eodag_utils, "EODataAccessGateway", return_value=dag
+        ), mock.patch.object(eodag_utils, "_search", return_value=[neighbour, wanted]):
+            eodag_utils.get_product_by_id(
+                prd_id, self._tmp_dir.name, provider="creodias"
+            )
+        dag.download.assert_called_once_with(wanted, outputs_prefix=self._tmp_dir.name)
+
+    def test_get_product_by_id_no_result(self):
+        with mock.patch.object(eodag_utils, "EODataAccessGateway"), mock.patch.object(
+            eodag_utils, "_search", return_value=[]
+        ):
+            with self.assertRaises(ValueError):
+                eodag_utils.get_product_by_id(
+                    "S2B_MSIL1C_20210714T131719", self._tmp_dir.name
+                )
+
+    def test_get_products_by_id_shared_dag(self):
+        prd_ids = [f"S2B_MSIL1C_20210714T131719_{index}" for index in range(4)]
+        dag = mock.MagicMock()
+        dag.download.side_effect = lambda product, outputs_prefix: product
+        with mock.patch.object(
+            eodag_utils, "EODataAccessGateway", return_value=dag
+        ) as gateway, mock.patch.object(
+            eodag_utils,
+            "_search",
+            side_effect=lambda dag, **kwargs: [
+                mock.MagicMock(properties={"id": kwargs["id"]})
+            ],
+        ), mock.patch.object(eodag_utils, "_SUBMIT_JITTER", 0):
+            outcomes = eodag_utils.get_products_by_id(
+                prd_ids, self._tmp_dir.name, provider="creodias", max_workers=2
+            )
+        # The gateway is created and configured once for all the products
+        gateway.assert_called_once_with()
+        dag.set_preferred_provider.assert_called_once_with("creodias")
+        self.assertEqual(sorted(prd_id for prd_id, _ in outcomes), prd_ids)
+        self.assertEqual(dag.download.call_count, 4)
+
+    @mock.patch.object(eodag_utils.time, "sleep")
+    @mock.patch.object(eodag_utils.random, "uniform", return_value=0.25)
+    @mock.patch.object(eodag_utils, "_download_product")
+    @mock.patch.object(eodag_utils, "_get_dag")
+    def test_get_products_by_id_jitter(self, get_dag, _download, _uniform, sleep):
+        get_dag.return_value = (mock.MagicMock(), "creodias")
+        prd_ids = [f"S2B_MSIL1C_20210714T131719_{index}" for index in range(5)]
+        eodag_utils.get_products_by_id(prd_ids, self._tmp_dir.name, max_workers=3)
+        # Only the first wave, except its first product, is delayed by the workers
+        self.assertEqual(sleep.call_args_list, [mock.call(0.25)] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+""" Test legacy utilities module
+"""
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+
+import numpy as np
+import rasterio
+from rasterio.transform import Affine
+
+from ewoc_dag.eodag_utils import EodagDownloadError
+from ewoc_dag.legacy import utils
+from ewoc_dag.legacy.utils import binary_scl, get_prods_from_json
+
+
+class Test_legacy_utils(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = TemporaryDirectory()
+        self.addCleanup(self._tmp_dir.cleanup)
+        self.tmp_dirpath = Path(self._tmp_dir.name)
+
+    def test_binary_scl(self):
+        # All the SCL classes, from 0 (nodata) to 11 (snow)
+        scl = np.tile(np.arange(12, dtype=np.uint8), (12, 1))
+        scl_filepath = self.tmp_dirpath / "SCL_20m.tif"
+        with rasterio.open(
+            scl_filepath,
+            "w",
+            driver="GTiff",
+            height=scl.shape[0],
+            width=scl.shape[1],
+            count=1,
+            dtype=scl.dtype,
+            crs="EPSG:32631",
+            transform=Affine(20, 0, 300000, 0, -20, 4800000),
+        ) as scl_file:
+            scl_file.write(scl, 1)
+
+        mask_filepath = self.tmp_dirpath / "MASK.tif"
+        binary_scl(scl_filepath, mask_filepath)
+
+        with rasterio.open(mask_filepath) as mask_file:
+            self.assertEqual(mask_file.nodata, 255)
+            self.assertEqual(mask_file.dtypes[0], "uint8")
+            self.assertEqual(mask_file.profile["compress"], "deflate")
+            mask = mask_file.read(1)
+        np.testing.assert_array_equal(mask[0], [255, 0, 1, 0, 1, 1, 1, 1, 0, 0, 0, 0])
+        np.testing.assert_array_equal(mask, np.tile(mask[0], (12, 1)))
+
+    def _write_plan(self):
+        plan = {
+            "31TCJ": {
+                "S2_PROC": {"INPUTS": [{"id": "S2A_31TCJ_1"}, {"id": "S2A_31TCJ_2"}]}
+            },
+            "31TCK": {"S2_PROC": {"INPUTS": [{"id": "S2A_31TCK_1"}]}},
+        }
+        plan_filepath = self.tmp_dirpath / "plan.json"
+        plan_filepath.write_text(json.dumps(plan), encoding="utf-8")
+        return plan_filepath
+
+    def test_get_prods_from_json(self):
+        plan_filepath = self._write_plan()
+        out_dirpath = self.tmp_dirpath / "out"
+        with mock.patch.object(
+            utils,
+            "get_products_by_id",
+            side_effect=lambda prd_ids, *args, **kwargs: [
+                (prd_id, "/path") for prd_id in prd_ids
+            ],
+        ) as get_products_by_id:
+            get_prods_from_json(str(plan_filepath), str(out_dirpath), "creodias")
+
+        # Each tile is downloaded in its own directory, side by side
+        self.assertEqual(
+            [call.args[:2] for call in get_products_by_id.call_args_list],
+            [
+                (["S2A_31TCJ_1", "S2A_31TCJ_2"], str(out_dirpath / "31TCJ")),
+                (["S2A_31TCK_1"], str(out_dirpath / "31TCK")),
+            ],
+        )
+        self.assertEqual(
+            sorted(path.name for path in out_dirpath.iterdir()), ["31TCJ", "31TCK"]
+        )
+
+    def test_get_prods_from_json_failures(self):
+        plan_filepath = self._write_plan()
+        error = ValueError("No results return by eodag!")
+        with mock.patch.object(
+            utils,
+            "get_products_by_id",
+            side_effect=lambda prd_ids, *args, **kwargs: [
+                (prd_id, error if prd_id.endswith("_2") else "/path")
+                for prd_id in prd_ids
+            ],
+        ) as get_products_by_id:
+            with self.assertRaises(EodagDownloadError) as context:
+                get_prods_from_json(str(plan_filepath), self._tmp_dir.name, "creodias")
+        # The failure of a tile does not stop the download of the next ones
+        self.assertEqual(get_products_by_id.call_count, 2)
+        self.assertEqual(context.exception.failures, [("S2A_31TCJ_2", error)])
+
+
+if __name__ == "__main__":
+    unittest.main()
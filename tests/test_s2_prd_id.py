@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+""" Test Sentinel-2 product id module
+"""
+from datetime import datetime
+import unittest
+
+from ewoc_dag.eo_prd_id.s2_prd_id import S2PrdIdInfo
+
+
+class Test_s2_prd_id(unittest.TestCase):
+    _L1C_PRD_ID = "S2B_MSIL1C_20210714T235249_N0301_R130_T57KUR_20210715T005654.SAFE"
+    _L2A_PRD_ID = "S2B_MSIL2A_20210714T131719_N0301_R124_T28WDB_20210714T160455"
+
+    def test_s2_prd_id_info(self):
+        s2_prd_id_info = S2PrdIdInfo(self._L1C_PRD_ID)
+        self.assertEqual(s2_prd_id_info.mission_id, "S2B")
+        self.assertEqual(s2_prd_id_info.product_level, "L1C")
+        self.assertEqual(
+            s2_prd_id_info.datatake_sensing_start_time,
+            datetime(2021, 7, 14, 23, 52, 49),
+        )
+        self.assertEqual(s2_prd_id_info.pdgs_processing_baseline_number, "0301")
+        self.assertEqual(s2_prd_id_info.relative_orbit_number, "130")
+        self.assertEqual(s2_prd_id_info.tile_id, "57KUR")
+        self.assertEqual(s2_prd_id_info.product_discriminator, "20210715T005654")
+        self.assertEqual(
+            repr(s2_prd_id_info), f"S2PrdIdInfo(s2_prd_id={self._L1C_PRD_ID[:-5]})"
+        )
+
+    def test_datatake_sensing_start_time(self):
+        s2_prd_id_info = S2PrdIdInfo(self._L2A_PRD_ID)
+        self.assertEqual(
+            s2_prd_id_info.datatake_sensing_start_time,
+            datetime.strptime("20210714T131719", S2PrdIdInfo.FORMAT_DATETIME),
+        )
+        # Invalid dates are rejected by the fast path as by strptime
+        for value in ["20211314T131719", "20210714T251719", "2021-07-14"]:
+            with self.assertRaises(ValueError):
+                s2_prd_id_info.datatake_sensing_start_time = value
+
+    def test_slots(self):
+        s2_prd_id_info = S2PrdIdInfo(self._L2A_PRD_ID)
+        with self.assertRaises(AttributeError):
+            s2_prd_id_info.unknown_attribute = "value"
+
+    def test_is_valid(self):
+        self.assertTrue(S2PrdIdInfo.is_valid(self._L1C_PRD_ID))
+        self.assertFalse(
+            S2PrdIdInfo.is_valid(
+                "S2B_MSIL2_20210714T131719_N0301_R124_T28WDB_20210714T160455.SAFE"
+            )
+        )
+        self.assertFalse(
+            S2PrdIdInfo.is_valid(
+                "S2B_MSIL1C_20210714T235249_N0301_R200_T57KUR_20210715T005654.SAFE"
+            )
+        )
+        self.assertTrue(S2PrdIdInfo.is_l1c(self._L1C_PRD_ID))
+        self.assertTrue(S2PrdIdInfo.is_l2a(self._L2A_PRD_ID))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Test legacy s3 management module"""
+
+import os
+import unittest
+
+from mock_s3_testcase import MockS3TestCase
+
+from ewoc_dag.legacy.s3man import recursive_upload_dir_to_s3
+
+
+class Test_s3man(MockS3TestCase):
+    _BUCKET_NAME = "test-ard-bucket"
+
+    def setUp(self):
+        super().setUp()
+        self.s3_client.create_bucket(Bucket=self._BUCKET_NAME)
+        self.local_dirpath = self.tmp_dirpath / "ard"
+        tile_dirpath = self.local_dirpath / "31" / "T" / "CJ"
+        tile_dirpath.mkdir(parents=True)
+        for band in ["B02", "B03"]:
+            (tile_dirpath / f"{band}.tif").write_bytes(b"1" * 10)
+        (tile_dirpath / "metadata.json").write_bytes(b"{}")
+
+    def _uploaded_keys(self):
+        response = self.s3_client.list_objects_v2(Bucket=self._BUCKET_NAME)
+        return sorted(obj["Key"] for obj in response["Contents"])
+
+    def test_recursive_upload_dir_to_s3(self):
+        tif_files_number, total_output_size = recursive_upload_dir_to_s3(
+            self.s3_client,
+            str(self.local_dirpath),
+            "c728b264/OPTICAL",
+            self._BUCKET_NAME,
+        )
+        self.assertEqual(tif_files_number, 2)
+        self.assertEqual(total_output_size, 22)
+        # The keys keep the s3 prefix and the path relative to the local directory
+        self.assertEqual(
+            self._uploaded_keys(),
+            [
+                "c728b264/OPTICAL/31/T/CJ/B02.tif",
+                "c728b264/OPTICAL/31/T/CJ/B03.tif",
+                "c728b264/OPTICAL/31/T/CJ/metadata.json",
+            ],
+        )
+
+    def test_recursive_upload_dir_to_s3_trailing_sep(self):
+        recursive_upload_dir_to_s3(
+            self.s3_client,
+            str(self.local_dirpath) + os.sep,
+            "c728b264/OPTICAL",
+            self._BUCKET_NAME,
+        )
+        self.assertIn("c728b264/OPTICAL/31/T/CJ/B02.tif", self._uploaded_keys())
+
+
+if __name__ == "__main__":
+    unittest.main()